@@ -8,7 +8,7 @@
 #   - WAV downloads run AFTER everything else (metadata/files/indexes)
 #   - WAV tagged to MATCH MP3 tags (ID3v2.4; includes WXXX "ID", TXXX "ID", artwork, lyrics, etc.)
 # - WAV also writes RIFF INFO tags for better Windows Explorer visibility (Title/Album/Track/Genre/Comments)
-# - Skip duplicates by ID (reads existing MP3/FLAC tags to detect)
+# - Skip duplicates by ID (reads existing MP3/FLAC tags to detect; IDs cached in pw_suno_profile\known_ids.json)
 # - Index XLSX Title column uses filename base (no extension), thumbnails preserved/added
 # - Retag Only mode: fills ONLY missing ID tags on MP3/FLAC, preserves timestamps,
 #   updates index titles (does NOT rewrite other tags, does NOT touch Title)
@@ -19,17 +19,24 @@
 #
 # Dependencies:
 #   pip install requests pillow openpyxl mutagen playwright
+#   pip install xlsxwriter        (optional, faster new index workbooks)
+#   pip install orjson            (optional, faster session / ID cache JSON)
 #   py -m playwright install
 #
 # Build (example):
 #   py -m PyInstaller --noconfirm --clean --onefile --noconsole --name "Suno_Playlist_Downloader_wav_support" --collect-all playwright "Suno_Downloader_Wav.py"
 #     
 #
+import io
+import copy
+import functools
 import os
 import re
+import atexit
 import sys
 import time
 import json
+import mmap
 import shutil
 import queue
 import threading
@@ -37,6 +44,8 @@ import subprocess
 import traceback
 import webbrowser
 import struct
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
@@ -48,6 +57,8 @@ from tkinter import simpledialog
 from tkinter.ttk import Progressbar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image as PILImage, ImageOps
 from openpyxl import Workbook, load_workbook
 from openpyxl.drawing.image import Image as XLImage
@@ -56,7 +67,6 @@ from mutagen.id3 import (
     ID3, TIT2, TALB, TRCK, TCON, USLT, COMM, APIC,
     WXXX, TXXX, TCOP, ID3NoHeaderError
 )
-from mutagen.mp3 import MP3
 
 # FLAC retag support
 try:
@@ -74,6 +84,22 @@ except Exception:
     WAVE = None  # type: ignore
     WAVE_AVAILABLE = False
 
+# Optional: xlsxwriter streams new index workbooks (openpyxl still handles edits)
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except Exception:
+    xlsxwriter = None  # type: ignore
+    XLSXWRITER_AVAILABLE = False
+
+# Optional: orjson for session files and the ID cache (stdlib json otherwise)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
 # Playwright WAV automation
 try:
     from playwright.sync_api import sync_playwright, TimeoutError as PWTimeoutError
@@ -113,6 +139,9 @@ CHROME_PATH_FILE = PERSIST_PROFILE_DIR / "chrome_path.txt"
 # Session storage
 SESSION_DIR = PERSIST_PROFILE_DIR / "sessions"
 
+# Clip IDs already read from audio tags, keyed by file path + (mtime, size)
+ID_CACHE_FILE = PERSIST_PROFILE_DIR / "known_ids.json"
+
 # PowerShell login script next to EXE/script
 SUNO_LOGIN_PS1 = APP_DIR / "suno_login.ps1"
 
@@ -123,6 +152,12 @@ ERR_LATEST = LOG_DIR / "suno_downloader_errors_latest.log"
 
 # Playwright settings
 PW_PER_SONG_TIMEOUT_MS = 180_000
+# Upper bound on waiting for a freshly loaded page to render its song menu button
+PW_PAGE_READY_TIMEOUT_MS = 5_000
+# Tabs in the shared context that prepare WAVs at the same time
+PW_WAV_TABS = 3
+# How long closing/login waits for the WAV browser to shut down before going ahead
+PW_RELEASE_TIMEOUT_MS = 10_000
 PW_CHROME_ARGS = [
     "--start-minimized",
     "--disable-notifications",
@@ -131,16 +166,30 @@ PW_CHROME_ARGS = [
 ]
 MORE_MENU_PATH_PREFIX = "M6 14q-.824"
 
+# MP3/artwork downloads run in parallel per playlist
+DOWNLOAD_WORKERS = 8
+
+# Playlist pages fetched concurrently per round after page 1
+PLAYLIST_PAGE_WINDOW = 4
+
+# Inputs whose metadata is fetched concurrently before the download pass
+PRESCAN_WORKERS = 8
+
+# Audio files whose tags are read concurrently when scanning for existing IDs
+SCAN_WORKERS = 16
+
 # UI console buffer
 UI_LOG_MAX_LINES = 25_000
-UI_LOG_QUEUE: "queue.Queue[str]" = queue.Queue()
+UI_LOG_TRIM_SLACK = UI_LOG_MAX_LINES // 10
+UI_LOG_MAX_DRAIN = 5000
+UI_LOG_QUEUE: "queue.SimpleQueue[str]" = queue.SimpleQueue()
 
-PROFILE_LOCK_FILES = [
+PROFILE_LOCK_FILES = frozenset({
     "SingletonLock",
     "SingletonCookie",
     "SingletonSocket",
     "Lockfile",
-]
+})
 
 HEADERS = [
     "Index", "Track #", "Playlist", "Title", "Length", "Artwork", "Genre",
@@ -150,9 +199,14 @@ HEADERS = [
 
 UUID_RE = re.compile(
     r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
-    re.IGNORECASE,
+    re.IGNORECASE | re.ASCII,
 )
 
+
+def _looks_like_uuid(s: str) -> bool:
+    # Cheap shape check that rejects most non-IDs before UUID_RE.fullmatch runs
+    return len(s) == 36 and s[8] == "-" and s[13] == "-" and s[18] == "-" and s[23] == "-"
+
 # ===================== UI Style =====================
 
 BG_COLOR         = "#150300"
@@ -170,44 +224,118 @@ FONT_SIZE        = 14
 
 # ===================== Logging =====================
 
+# Per-clip / per-input errors log a one-line message; SUNO_DEBUG=1 adds the traceback.
+# Scan, session, WAV-phase and fatal errors always include it.
+DEBUG_TRACEBACKS = os.environ.get("SUNO_DEBUG") == "1"
+
+# Log file lines are queued by _ConsoleCapture and written in batches by a
+# background flusher instead of write()+flush() per line. Lines are encoded
+# once in write(); the files are binary so nothing is re-encoded per handle.
+LOG_FLUSH_INTERVAL_S = 0.25
+_LOG_PENDING: List[Tuple[Tuple[Any, ...], bytes]] = []
+_LOG_PENDING_LOCK = threading.Lock()
+# Serializes flushers so batches reach the files in order; print() never waits on it
+_LOG_WRITE_LOCK = threading.Lock()
+
+
+def _flush_log_files() -> None:
+    with _LOG_WRITE_LOCK:
+        # Only the swap happens under the pending lock, the disk I/O runs outside it
+        with _LOG_PENDING_LOCK:
+            if not _LOG_PENDING:
+                return
+            pending, _LOG_PENDING[:] = _LOG_PENDING[:], []
+
+        by_fh: Dict[Any, List[bytes]] = {}
+        for fhs, out in pending:
+            for fh in fhs:
+                by_fh.setdefault(fh, []).append(out)
+
+        for fh, outs in by_fh.items():
+            try:
+                fh.write(b"".join(outs))
+                fh.flush()
+            except Exception:
+                pass
+
+
+_TS_CACHE: Tuple[int, str] = (0, "")
+
+
+def _now_ts() -> str:
+    # Log timestamps have 1 s resolution; only re-format when the second changes
+    global _TS_CACHE
+    now = int(time.time())
+    cached = _TS_CACHE
+    if cached[0] != now:
+        cached = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+        _TS_CACHE = cached
+    return cached[1]
+
+
+def _log_flush_loop() -> None:
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL_S)
+        _flush_log_files()
+
+
 class _ConsoleCapture:
     def __init__(self, fhs, tag: str, also=None):
-        self.fhs = [fh for fh in (fhs or []) if fh]
+        self.fhs = tuple(fh for fh in (fhs or []) if fh)
         self.tag = tag
         self.also = also
-        self._buf = ""
+        # print() from the download threads arrives here concurrently and writes the
+        # text and the newline separately, so partial lines are kept per thread.
+        # Fragments are joined once a newline arrives, not concatenated per write.
+        self._bufs: Dict[int, List[str]] = {}
+        self._lock = threading.RLock()
 
     def write(self, s: str):
         if not s:
             return
-        self._buf += s
-        while "\n" in self._buf:
-            line, self._buf = self._buf.split("\n", 1)
-            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            out = f"[{ts}] [{self.tag}] {line}\n"
+        tid = threading.get_ident()
+        with self._lock:
+            if "\n" not in s:
+                self._bufs.setdefault(tid, []).append(s)
+                return
 
-            for fh in self.fhs:
-                try:
-                    fh.write(out)
-                    fh.flush()
-                except Exception:
-                    pass
+            parts = self._bufs.pop(tid, None)
+            if parts:
+                parts.append(s)
+                s = "".join(parts)
 
-            try:
-                UI_LOG_QUEUE.put_nowait(out)
-            except Exception:
-                pass
+            *lines, tail = s.split("\n")
+            if tail:
+                self._bufs[tid] = [tail]
+
+            ts = _now_ts()
+            outs: List[bytes] = []
+            for line in lines:
+                out = f"[{ts}] [{self.tag}] {line}\n"
+                if self.fhs:
+                    outs.append(out.encode("utf-8", errors="replace"))
 
-            if self.also:
                 try:
-                    self.also.write(line + "\n")
-                    self.also.flush()
+                    UI_LOG_QUEUE.put_nowait(out)
                 except Exception:
                     pass
 
+                if self.also:
+                    try:
+                        self.also.write(line + "\n")
+                        self.also.flush()
+                    except Exception:
+                        pass
+
+            if self.fhs:
+                with _LOG_PENDING_LOCK:
+                    _LOG_PENDING.extend((self.fhs, out) for out in outs)
+
     def flush(self):
-        if self._buf:
-            self.write("\n")
+        with self._lock:
+            if threading.get_ident() in self._bufs:
+                self.write("\n")
+        _flush_log_files()
 
 
 _LOG_FH = None
@@ -224,8 +352,8 @@ def setup_profile_logging() -> Path:
     run_log = LOG_DIR / f"suno_downloader_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     err_log = LOG_DIR / f"suno_downloader_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
-    _LOG_FH = open(run_log, "a", encoding="utf-8", errors="replace")
-    _ERR_FH = open(err_log, "a", encoding="utf-8", errors="replace")
+    _LOG_FH = open(run_log, "ab", buffering=1 << 16)
+    _ERR_FH = open(err_log, "ab", buffering=1 << 16)
 
     try:
         LOG_LATEST.write_text(f"Latest run log: {run_log}\n", encoding="utf-8", errors="replace")
@@ -242,6 +370,9 @@ def setup_profile_logging() -> Path:
     sys.stdout = _ConsoleCapture([_LOG_FH], "OUT", also=out_also)
     sys.stderr = _ConsoleCapture([_LOG_FH, _ERR_FH], "ERR", also=err_also)
 
+    threading.Thread(target=_log_flush_loop, name="log-flush", daemon=True).start()
+    atexit.register(_flush_log_files)
+
     def _log_uncaught(exc_type, exc, tb):
         print("UNCAUGHT EXCEPTION:", file=sys.stderr)
         print("".join(traceback.format_exception(exc_type, exc, tb)), file=sys.stderr)
@@ -288,13 +419,12 @@ def _bootstrap_message(title: str, text: str):
 # ===================== Self-watcher mode (relaunch after login) =====================
 
 def _profile_is_locked(profile_dir: Path) -> bool:
+    # Polled every 0.5-1 s by the watcher: one directory listing instead of a stat per lock name
     try:
-        for nm in PROFILE_LOCK_FILES:
-            if (profile_dir / nm).exists():
-                return True
+        with os.scandir(profile_dir) as it:
+            return any(e.name in PROFILE_LOCK_FILES for e in it)
     except Exception:
         return False
-    return False
 
 
 def run_bootstrap_watcher_and_relaunch():
@@ -414,7 +544,12 @@ def _read_saved_chrome_path() -> Optional[Path]:
     return None
 
 
+_CHROME_EXE: Optional[Path] = None
+
+
 def _write_saved_chrome_path(p: Path):
+    global _CHROME_EXE
+    _CHROME_EXE = p
     try:
         PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
         CHROME_PATH_FILE.write_text(str(p), encoding="utf-8")
@@ -456,9 +591,16 @@ def find_chrome_candidates() -> List[Path]:
 
 
 def find_chrome_exe() -> Optional[Path]:
+    global _CHROME_EXE
+    # Startup, login and every WAV run all ask; only re-probe the candidates if the cached one vanished
+    if _CHROME_EXE is not None and _CHROME_EXE.exists():
+        return _CHROME_EXE
+    _CHROME_EXE = None
+
     for p in find_chrome_candidates():
         try:
             if p.exists():
+                _CHROME_EXE = p
                 return p
         except Exception:
             pass
@@ -641,26 +783,7 @@ def _profile_looks_initialized(profile_dir: Path) -> bool:
     return False
 
 
-def first_launch_bootstrap_then_exit_if_needed():
-    chrome_path = ensure_chrome_exe()
-    if not chrome_path or not chrome_path.exists():
-        _bootstrap_message("Chrome not available", "Chrome is required. Install it (or browse to chrome.exe) and rerun.")
-        sys.exit(0)
-
-    if BOOTSTRAP_MARK_FILE.exists():
-        print("[BOOTSTRAP] Marker exists. Continuing normal launch.")
-        return
-
-    need_bootstrap = not _profile_looks_initialized(PERSIST_PROFILE_DIR)
-
-    if not need_bootstrap:
-        try:
-            PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
-            BOOTSTRAP_MARK_FILE.write_text("ok", encoding="utf-8")
-        except Exception:
-            pass
-        return
-
+def _init_profile_with_playwright(chrome_path: Path) -> bool:
     if not PLAYWRIGHT_AVAILABLE:
         _bootstrap_message(
             "Playwright missing",
@@ -668,9 +791,7 @@ def first_launch_bootstrap_then_exit_if_needed():
             "  py -m pip install --upgrade playwright\n"
             "  py -m playwright install"
         )
-        sys.exit(0)
-
-    PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        return False
 
     print("[BOOTSTRAP] Initializing profile with Playwright (headless)…")
     try:
@@ -692,13 +813,41 @@ def first_launch_bootstrap_then_exit_if_needed():
                 pass
     except Exception as e:
         _bootstrap_message("Bootstrap failed", f"Failed to initialize profile:\n\n{e}")
-        sys.exit(0)
+        return False
+    return True
+
 
+def _write_bootstrap_mark() -> None:
     try:
         BOOTSTRAP_MARK_FILE.write_text("ok", encoding="utf-8")
     except Exception as e:
         print(f"[BOOTSTRAP] Warning: could not write marker: {e}", file=sys.stderr)
 
+
+def first_launch_bootstrap_then_exit_if_needed():
+    chrome_path = ensure_chrome_exe()
+    if not chrome_path or not chrome_path.exists():
+        _bootstrap_message("Chrome not available", "Chrome is required. Install it (or browse to chrome.exe) and rerun.")
+        sys.exit(0)
+
+    if BOOTSTRAP_MARK_FILE.exists():
+        print("[BOOTSTRAP] Marker exists. Continuing normal launch.")
+        return
+
+    need_bootstrap = not _profile_looks_initialized(PERSIST_PROFILE_DIR)
+
+    if not need_bootstrap:
+        try:
+            PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            BOOTSTRAP_MARK_FILE.write_text("ok", encoding="utf-8")
+        except Exception:
+            pass
+        return
+
+    # The login Chrome below is started with --user-data-dir on this folder and creates
+    # Default/ and Local State itself, so no headless Playwright pass is needed first.
+    PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
     _bootstrap_message(
         "First run: Suno login required",
         "Chrome will open for Suno login.\n\n"
@@ -707,45 +856,88 @@ def first_launch_bootstrap_then_exit_if_needed():
         "3) The downloader will relaunch automatically"
     )
 
+    try:
+        launch_chrome_login_via_powershell(chrome_path)
+    except Exception as e:
+        # No PowerShell: initialize the profile headlessly and continue into the app instead
+        print(f"[BOOTSTRAP] Could not launch Chrome for login: {e}", file=sys.stderr)
+        if not _init_profile_with_playwright(chrome_path):
+            sys.exit(0)
+        _write_bootstrap_mark()
+        _bootstrap_message(
+            "Suno login",
+            f"Chrome could not be opened for login:\n\n{e}\n\n"
+            "The profile was initialized; sign in later with “Suno Login (Chrome)”."
+        )
+        return
+
+    # Only once the profile is in use, so a failed first run bootstraps again next time
+    _write_bootstrap_mark()
     _spawn_watcher_detached()
-    launch_chrome_login_via_powershell(chrome_path)
     _hard_exit_soon(250)
 
 
 # ===================== Utilities =====================
 
-def format_created(raw) -> str:
+@functools.lru_cache(maxsize=4096)
+def format_created(raw: str) -> str:
     try:
-        iso = str(raw).rstrip("Z")
+        iso = raw.rstrip("Z")
         dt = datetime.fromisoformat(iso)
         return dt.strftime("%m-%d-%Y %I:%M:%S %p")
     except Exception:
-        return str(raw)
+        return raw
+
+
+def _s(x: Any) -> str:
+    # str(x or "") without a new object for values that already are strings
+    return x if isinstance(x, str) else str(x or "")
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    # UTF-8 JSON bytes; non-ASCII is written as-is on both paths
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    # orjson rejects invalid UTF-8; the stdlib retry keeps the lenient decoding
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass
+    return json.loads(raw.decode("utf-8", errors="replace"))
+
+
+# URL forms (playlist/clip/song path or ?id=) win over the bare-ID fallback,
+# so the fallback stays a separate search rather than part of the alternation.
+_ID_URL_RE = re.compile(r"(?:/playlists?/|/clips?/|/song/|[?&]id=)([A-Za-z0-9-]+)")
+_ID_BARE_RE = re.compile(r"[A-Za-z0-9-]{22,36}")
 
 
 def extract_id(s: str) -> str:
-    patterns = [
-        re.compile(r"/playlists?/([A-Za-z0-9-]+)"),
-        re.compile(r"/playlist/([A-Za-z0-9-]+)"),
-        re.compile(r"/clips?/([A-Za-z0-9-]+)"),
-        re.compile(r"/song/([A-Za-z0-9-]+)"),
-        re.compile(r"[?&]id=([A-Za-z0-9-]+)"),
-        re.compile(r"([A-Za-z0-9-]{22,36})"),
-    ]
-    for pat in patterns:
-        m = pat.search(s)
-        if m:
-            return m.group(1)
+    m = _ID_URL_RE.search(s)
+    if m:
+        return m.group(1)
+    m = _ID_BARE_RE.search(s)
+    if m:
+        return m.group(0)
     raise ValueError("Could not extract ID from input.")
 
 
+_FILENAME_STRIP = str.maketrans("", "", '\\/:*?"<>|')
+_SHEET_NAME_STRIP = str.maketrans("", "", ":\\/?*[]")
+
+
 def sanitize(name: str) -> str:
-    return re.sub(r'[\\/:*?"<>|]', "", name or "")
+    return (name or "").translate(_FILENAME_STRIP)
 
 
 def safe_sheet_name(name: str) -> str:
     n = (name or "Sheet").strip()
-    n = re.sub(r"[:\\/?*\[\]]", "", n).strip() or "Sheet"
+    n = n.translate(_SHEET_NAME_STRIP).strip() or "Sheet"
     if len(n) > 31:
         n = n[:31].rstrip() or "Sheet"
     return n
@@ -753,18 +945,89 @@ def safe_sheet_name(name: str) -> str:
 
 # ===================== Suno API =====================
 
-def fetch_playlist(playlist_id: str) -> Tuple[str, List[Dict[str, Any]]]:
-    clips: List[Dict[str, Any]] = []
-    page = 1
+@dataclass(slots=True)
+class Clip:
+    title: str = ""
+    id: str = ""
+    duration: str = "0:00"
+    tags: str = ""
+    prompt: str = ""
+    lyrics: str = ""
+    gpt: str = ""
+    type: str = ""
+    model: str = ""
+    model_name: str = ""
+    weight: Optional[float] = None
+    creativity: Optional[float] = None
+    img: Optional[str] = None
+    aud: Optional[str] = None
+    vid: Optional[str] = None
+    created: str = ""
+    rel_idx: int = 0
+    playlist: str = ""
+    # Filled in by download_worker
+    master_idx: Optional[int] = None
+    index_title: str = ""
+    thumb_path: Optional[str] = None
+    thumb_png: Optional[bytes] = None
+    cover_path: Optional[str] = None
+
+
+def _pooled_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    # Keep-alive session shared across threads, with retries on transient errors
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Metadata API session; sized for every prescan input paging at once
+_API = _pooled_session(4, PRESCAN_WORKERS * PLAYLIST_PAGE_WINDOW)
+
+
+def _fetch_playlist_page(playlist_id: str, page: int) -> Dict[str, Any]:
+    url = f"https://studio-api.prod.suno.com/api/playlist/{playlist_id}/?page={page}"
+    r = _API.get(url, timeout=(10, 60))
+    r.raise_for_status()
+    return _json_loads(r.content)
+
+
+def _iter_playlist_pages(playlist_id: str):
+    # Page 1 is fetched on its own so a bad ID fails fast (HTTPError -> clip fallback).
+    # After that, pages are requested PLAYLIST_PAGE_WINDOW at a time and yielded in
+    # order up to the first empty one; anything fetched past it is discarded.
+    data = _fetch_playlist_page(playlist_id, 1)
+    yield data
+    if not data.get("playlist_clips"):
+        return
+
+    page = 2
+    with ThreadPoolExecutor(max_workers=PLAYLIST_PAGE_WINDOW) as ex:
+        while True:
+            window = range(page, page + PLAYLIST_PAGE_WINDOW)
+            for data in ex.map(lambda p: _fetch_playlist_page(playlist_id, p), window):
+                yield data
+                if not data.get("playlist_clips"):
+                    return
+            page += PLAYLIST_PAGE_WINDOW
+
+
+def fetch_playlist(playlist_id: str) -> Tuple[str, List[Clip]]:
+    clips: List[Clip] = []
     playlist_name = ""
     rel_index = 1
 
-    while True:
-        url = f"https://studio-api.prod.suno.com/api/playlist/{playlist_id}/?page={page}"
-        r = requests.get(url, timeout=60)
-        r.raise_for_status()
-        data = r.json()
-
+    for data in _iter_playlist_pages(playlist_id):
         if not playlist_name:
             playlist_name = data.get("name", "Playlist")
 
@@ -794,38 +1057,36 @@ def fetch_playlist(playlist_id: str) -> Tuple[str, List[Dict[str, Any]]]:
                 or ""
             )
 
-            clips.append({
-                "title":      clip.get("title", "") or "",
-                "id":         clip.get("id", "") or "",
-                "duration":   f"{m}:{s:02d}",
-                "tags":       md.get("tags", "") or "",
-                "prompt":     md.get("prompt", "") or "",
-                "lyrics":     lyrics,
-                "gpt":        md.get("gpt_description_prompt", "") or "",
-                "type":       md.get("type", "") or "",
-                "model":      clip.get("major_model_version", "") or "",
-                "model_name": clip.get("model_name", "") or "",
-                "weight":     weight,
-                "creativity": creativity,
-                "img":        clip.get("image_large_url"),
-                "aud":        clip.get("audio_url"),
-                "vid":        clip.get("video_url"),
-                "created":    clip.get("created_at", "") or "",
-                "rel_idx":    rel_index,
-                "playlist":   playlist_name
-            })
+            clips.append(Clip(
+                title=clip.get("title", "") or "",
+                id=clip.get("id", "") or "",
+                duration=f"{m}:{s:02d}",
+                tags=md.get("tags", "") or "",
+                prompt=md.get("prompt", "") or "",
+                lyrics=lyrics,
+                gpt=md.get("gpt_description_prompt", "") or "",
+                type=md.get("type", "") or "",
+                model=clip.get("major_model_version", "") or "",
+                model_name=clip.get("model_name", "") or "",
+                weight=weight,
+                creativity=creativity,
+                img=clip.get("image_large_url"),
+                aud=clip.get("audio_url"),
+                vid=clip.get("video_url"),
+                created=clip.get("created_at", "") or "",
+                rel_idx=rel_index,
+                playlist=playlist_name,
+            ))
             rel_index += 1
 
-        page += 1
-
     return playlist_name, clips
 
 
-def fetch_clip(clip_id: str) -> List[Dict[str, Any]]:
+def fetch_clip(clip_id: str) -> List[Clip]:
     url = f"https://studio-api.prod.suno.com/api/clip/{clip_id}"
-    r = requests.get(url, timeout=60)
+    r = _API.get(url, timeout=(10, 60))
     r.raise_for_status()
-    data = r.json()
+    data = _json_loads(r.content)
     clip = data.get("clip", data) or {}
     md = clip.get("metadata", {}) or {}
 
@@ -847,126 +1108,163 @@ def fetch_clip(clip_id: str) -> List[Dict[str, Any]]:
         or ""
     )
 
-    return [{
-        "title":      clip.get("title", clip_id) or clip_id,
-        "id":         clip_id,
-        "duration":   f"{m}:{s:02d}",
-        "tags":       md.get("tags", "") or "",
-        "prompt":     md.get("prompt", "") or "",
-        "lyrics":     lyrics,
-        "gpt":        md.get("gpt_description_prompt", "") or "",
-        "type":       md.get("type", "") or "",
-        "model":      clip.get("major_model_version", "") or "",
-        "model_name": clip.get("model_name", "") or "",
-        "weight":     weight,
-        "creativity": creativity,
-        "img":        clip.get("image_large_url"),
-        "aud":        clip.get("audio_url"),
-        "vid":        clip.get("video_url"),
-        "created":    clip.get("created_at", "") or "",
-        "rel_idx":    1,
-        "playlist":   "Unsorted"
-    }]
+    return [Clip(
+        title=clip.get("title", clip_id) or clip_id,
+        id=clip_id,
+        duration=f"{m}:{s:02d}",
+        tags=md.get("tags", "") or "",
+        prompt=md.get("prompt", "") or "",
+        lyrics=lyrics,
+        gpt=md.get("gpt_description_prompt", "") or "",
+        type=md.get("type", "") or "",
+        model=clip.get("major_model_version", "") or "",
+        model_name=clip.get("model_name", "") or "",
+        weight=weight,
+        creativity=creativity,
+        img=clip.get("image_large_url"),
+        aud=clip.get("audio_url"),
+        vid=clip.get("video_url"),
+        created=clip.get("created_at", "") or "",
+        rel_idx=1,
+        playlist="Unsorted",
+    )]
+
+
+def fetch_input(pid: str) -> Tuple[str, List[Clip]]:
+    # An input ID is tried as a playlist first; an HTTP error falls back to a single clip
+    try:
+        return fetch_playlist(pid)
+    except requests.HTTPError:
+        return "Unsorted", fetch_clip(pid)
 
 
 # ===================== File download helpers =====================
 
-def save_mp3(clip: Dict[str, Any], folder: str, filename_base: str) -> Optional[str]:
+# One pooled session shared by the download threads (audio/image CDN hosts)
+SESSION = _pooled_session(16, 16)
+
+
+def _stream_to_file(url: str, path: str) -> None:
+    with SESSION.get(url, stream=True, timeout=(10, 120)) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        try:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(r.raw, f, length=1024 * 1024)
+        except Exception:
+            # A truncated file would be treated as "already downloaded" on the next run
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+            raise
+
+
+def save_mp3(clip: Clip, folder: str, filename_base: str) -> Optional[str]:
     os.makedirs(folder, exist_ok=True)
     mp3_path = os.path.join(folder, f"{filename_base}.mp3")
-    url = clip.get("aud")
+    url = clip.aud
     if not url:
         return None
     try:
-        r = requests.get(url, timeout=120)
-        r.raise_for_status()
-        with open(mp3_path, "wb") as f:
-            f.write(r.content)
+        _stream_to_file(url, mp3_path)
         return mp3_path
     except Exception as e:
         print(f"[MP3] Download failed: {e}", file=sys.stderr)
         return None
 
 
-def download_image(url: str, folder: str, filename_base: str) -> Tuple[Optional[str], Optional[str]]:
+def download_image(url: str, folder: str, filename_base: str) -> Tuple[Optional[str], Optional[str], Optional[bytes]]:
+    """
+    Returns (cover_path, thumb_path, thumb_png). The 40x40 PNG is encoded once and
+    returned as bytes as well, so the index can embed it without re-reading _thumbs.
+    """
     if not url:
-        return None, None
+        return None, None, None
     os.makedirs(folder, exist_ok=True)
     ext = os.path.splitext(urlparse(url).path)[1] or ".jpg"
     full = os.path.join(folder, f"{filename_base}{ext}")
     try:
-        r = requests.get(url, timeout=120)
-        r.raise_for_status()
-        with open(full, "wb") as f:
-            f.write(r.content)
+        _stream_to_file(url, full)
 
         thumbs = os.path.join(folder, "_thumbs")
         os.makedirs(thumbs, exist_ok=True)
         thumb = os.path.join(thumbs, f"{filename_base}.png")
 
-        img = PILImage.open(full)
-        img = ImageOps.fit(img, (40, 40), method=PILImage.Resampling.LANCZOS)
-        img.save(thumb)
-        return full, thumb
+        with PILImage.open(full) as img:
+            # Let libjpeg scale in the DCT domain instead of decoding the full-size cover (no-op for PNG)
+            img.draft("RGB", (80, 80))
+            img = ImageOps.fit(img, (40, 40), method=PILImage.Resampling.BOX)
+            buf = io.BytesIO()
+            img.save(buf, format="PNG", compress_level=1)
+        png = buf.getvalue()
+        with open(thumb, "wb") as f:
+            f.write(png)
+        return full, thumb, png
     except Exception as e:
         print(f"[IMG] Download/thumb failed: {e}", file=sys.stderr)
-        return None, None
+        return None, None, None
 
 
-def save_txt(folder: str, filename_base: str, text: str) -> Optional[str]:
-    os.makedirs(folder, exist_ok=True)
-    path = os.path.join(folder, f"{filename_base}.txt")
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(text or "")
-        return path
-    except Exception as e:
-        print(f"[TXT] Save failed: {e}", file=sys.stderr)
-        return None
+def save_txts(filename_base: str, items: List[Tuple[str, str]]) -> None:
+    # Writes "<folder>/<filename_base>.txt" for each (folder, text); the folders are created
+    # once per input by the caller. Encoded once and written in binary (newlines translated
+    # like text mode would), so each file is a single open/write/close.
+    for folder, text in items:
+        path = f"{folder}{os.sep}{filename_base}.txt"
+        if os.linesep != "\n":
+            text = text.replace("\n", os.linesep)
+        try:
+            with open(path, "wb") as f:
+                f.write(text.encode("utf-8"))
+        except Exception as e:
+            print(f"[TXT] Save failed: {e}", file=sys.stderr)
 
 
 # ===================== Tagging (MP3 + WAV) =====================
 
-def _populate_id3_common(id3: ID3, clip: Dict[str, Any], img_path: Optional[str]):
-    # Clear existing frames
-    for frame in list(id3.keys()):
-        try:
-            del id3[frame]
-        except Exception:
-            pass
+@functools.lru_cache(maxsize=8)
+def _apic_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    # Keyed on mtime/size so the MP3 and WAV tagging of a song share one read of its cover.
+    # Kept small and cleared when a run ends, so covers aren't held for the process lifetime.
+    with open(path, "rb") as f:
+        return f.read()
 
+
+def _populate_id3_common(id3: ID3, clip: Clip, img_path: Optional[str]):
+    # Expects an empty tag; callers start from ID3() or clear() what the file had
     # Core
-    id3.add(TIT2(encoding=3, text=str(clip.get("title", ""))))
-    id3.add(TALB(encoding=3, text=str(clip.get("playlist", ""))))
-    id3.add(TRCK(encoding=3, text=str(clip.get("rel_idx", ""))))
+    id3.add(TIT2(encoding=3, text=_s(clip.title)))
+    id3.add(TALB(encoding=3, text=_s(clip.playlist)))
+    id3.add(TRCK(encoding=3, text=str(clip.rel_idx)))
 
     # Genre/tags
-    if clip.get("tags"):
-        id3.add(TCON(encoding=3, text=str(clip.get("tags"))))
+    if clip.tags:
+        id3.add(TCON(encoding=3, text=_s(clip.tags)))
 
     # Lyrics
-    lyrics_text = clip.get("lyrics") or clip.get("prompt") or ""
+    lyrics_text = clip.lyrics or clip.prompt or ""
     if lyrics_text:
         id3.add(USLT(encoding=3, lang="eng", desc="", text=str(lyrics_text)))
 
     # Created date
-    created_raw = clip.get("created")
+    created_raw = clip.created
     if created_raw:
-        id3.add(TCOP(encoding=3, text=format_created(created_raw)))
+        id3.add(TCOP(encoding=3, text=format_created(str(created_raw))))
 
     # Comment: gpt + sliders
-    original_comment = clip.get("gpt", "") or ""
+    original_comment = clip.gpt or ""
     parts: List[str] = []
-    if clip.get("weight") is not None:
-        parts.append(f"Weight: {clip['weight']}")
-    if clip.get("creativity") is not None:
-        parts.append(f"Creativity: {clip['creativity']}")
+    if clip.weight is not None:
+        parts.append(f"Weight: {clip.weight}")
+    if clip.creativity is not None:
+        parts.append(f"Creativity: {clip.creativity}")
     comment_text = " | ".join(filter(None, [original_comment, ", ".join(parts)]))
     if comment_text:
         id3.add(COMM(encoding=3, lang="eng", desc="", text=str(comment_text)))
 
     # ID in WXXX + TXXX
-    clip_id = (str(clip.get("id") or "")).strip()
+    clip_id = _s(clip.id).strip()
     if clip_id:
         id3.add(WXXX(encoding=3, desc="ID", url=clip_id))
         id3.add(TXXX(encoding=3, desc="ID", text=[clip_id]))
@@ -975,38 +1273,27 @@ def _populate_id3_common(id3: ID3, clip: Dict[str, Any], img_path: Optional[str]
     if img_path and os.path.exists(img_path):
         ext = os.path.splitext(img_path)[1].lower()
         mime = "image/jpeg" if ext in (".jpg", ".jpeg") else "image/png"
-        with open(img_path, "rb") as imgf:
-            id3.add(APIC(encoding=3, mime=mime, type=3, desc="Cover", data=imgf.read()))
+        st = os.stat(img_path)
+        data = _apic_bytes(img_path, st.st_mtime_ns, st.st_size)
+        id3.add(APIC(encoding=3, mime=mime, type=3, desc="Cover", data=data))
 
 
-def embed_tags_full_rewrite_mp3(mp3_path: str, clip: Dict[str, Any], img_path: Optional[str]):
+def embed_tags_full_rewrite_mp3(mp3_path: str, clip: Clip, img_path: Optional[str]):
     try:
-        try:
-            MP3(mp3_path)
-        except Exception:
-            pass
-
-        try:
-            id3 = ID3(mp3_path)
-        except ID3NoHeaderError:
-            id3 = ID3()
-        except Exception:
-            id3 = ID3()
-
+        # Every frame is replaced, so don't parse the old tag; save() still
+        # overwrites whatever ID3v2 header the file already has.
+        id3 = ID3()
         _populate_id3_common(id3, clip, img_path)
         id3.save(mp3_path, v2_version=4)
 
     except Exception as e:
         print(f"[TAG] Failed tagging MP3 {mp3_path}: {e}", file=sys.stderr)
-        print(traceback.format_exc(), file=sys.stderr)
+        if DEBUG_TRACEBACKS:
+            print(traceback.format_exc(), file=sys.stderr)
 
 
-def _riff_info_pack_string(s: str) -> bytes:
-    if s is None:
-        s = ""
-    s = str(s)
-    b = s.encode("utf-8", errors="replace") + b"\x00"
-    return b
+# Terminating NUL plus the RIFF pad byte when the NUL-terminated size is odd
+_NUL_AND_PAD = (b"\x00", b"\x00\x00")
 
 
 def _make_riff_info_chunk(fields: Dict[str, str]) -> bytes:
@@ -1022,107 +1309,184 @@ def _make_riff_info_chunk(fields: Dict[str, str]) -> bytes:
         "date": "ICRD",
     }
 
-    subchunks: List[bytes] = []
+    # One growing buffer; the LIST size is patched in once all subchunks are in
+    buf = bytearray(b"LIST\x00\x00\x00\x00INFO")
     for k, cid in mapping.items():
         val = fields.get(k, "")
         if not val:
             continue
-        data = _riff_info_pack_string(val)
-        size = len(data)
-        sub = cid.encode("ascii") + struct.pack("<I", size) + data
-        if size % 2 == 1:
-            sub += b"\x00"
-        subchunks.append(sub)
-
-    list_data = b"INFO" + b"".join(subchunks)
-    list_size = len(list_data)
-    chunk = b"LIST" + struct.pack("<I", list_size) + list_data
-    if list_size % 2 == 1:
-        chunk += b"\x00"
-    return chunk
-
-
-def _copy_stream(fsrc, fdst, nbytes: int, buf: int = 1024 * 1024) -> None:
+        data = str(val).encode("utf-8", errors="replace")
+        size = len(data) + 1  # NUL-terminated
+        buf += cid.encode("ascii")
+        buf += struct.pack("<I", size)
+        buf += data
+        buf += _NUL_AND_PAD[size & 1]
+
+    # Every subchunk is padded to even length, so the LIST itself never needs a pad byte
+    struct.pack_into("<I", buf, 4, len(buf) - 8)
+    return bytes(buf)
+
+
+_COPY_BUF_SIZE = 8 * 1024 * 1024
+
+
+def _copy_stream(fsrc, fdst, nbytes: int) -> None:
     remaining = nbytes
+
+    # Kernel-side copy where the platform supports it for regular files (Linux)
+    if remaining > 0 and hasattr(os, "sendfile"):
+        try:
+            sfd, dfd = fsrc.fileno(), fdst.fileno()
+            fdst.flush()
+            off = fsrc.tell()
+        except Exception:
+            sfd = None
+        if sfd is not None:
+            try:
+                while remaining > 0:
+                    n = os.sendfile(dfd, sfd, off, min(remaining, 1 << 24))
+                    if n == 0:
+                        break
+                    off += n
+                    remaining -= n
+            except OSError:
+                pass  # e.g. macOS only sends to sockets; copy the rest below
+            fsrc.seek(off)
+            fdst.seek(0, os.SEEK_END)
+            if remaining <= 0:
+                return
+
+    # Buffered fallback (Windows): one reused buffer instead of a bytes object per read
+    if remaining <= 0:
+        return
+    mv = memoryview(bytearray(min(remaining, _COPY_BUF_SIZE)))
     while remaining > 0:
-        take = buf if remaining > buf else remaining
-        b = fsrc.read(take)
-        if not b:
+        n = fsrc.readinto(mv[:remaining] if remaining < len(mv) else mv)
+        if not n:
             break
-        fdst.write(b)
-        remaining -= len(b)
+        fdst.write(mv[:n])
+        remaining -= n
+
+
+def _scan_riff_chunks(mm) -> List[Tuple[bytes, int, int]]:
+    # (chunk id, header offset, payload size) for each top-level chunk after the WAVE header
+    chunks: List[Tuple[bytes, int, int]] = []
+    off, end = 12, len(mm)
+    while off + 8 <= end:
+        cid, size = struct.unpack_from("<4sI", mm, off)
+        chunks.append((cid, off, size))
+        off += 8 + size + (size & 1)
+    return chunks
 
 
 def _rewrite_wav_remove_info_and_append(wav_path: str, info_chunk: bytes) -> None:
     tmp_path = wav_path + ".tmp"
-    with open(wav_path, "rb") as src, open(tmp_path, "wb") as dst:
-        header = src.read(12)
-        if len(header) != 12 or header[0:4] != b"RIFF" or header[8:12] != b"WAVE":
+    with open(wav_path, "rb") as src:
+        # Chunk headers are walked on a read-only map; the kept byte ranges are then
+        # copied file-to-file, adjacent chunks merged into one copy.
+        try:
+            mm = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mm = None  # empty file
+        if mm is None:
             raise RuntimeError("Not a valid RIFF/WAVE file")
 
-        dst.write(header)
+        with mm:
+            header = mm[0:12]
+            if len(header) != 12 or header[0:4] != b"RIFF" or header[8:12] != b"WAVE":
+                raise RuntimeError("Not a valid RIFF/WAVE file")
 
-        while True:
-            hdr = src.read(8)
-            if len(hdr) < 8:
-                break
-            cid = hdr[0:4]
-            size = struct.unpack("<I", hdr[4:8])[0]
-
-            if cid == b"LIST" and size >= 4:
-                list_type = src.read(4)
-                remaining = size - 4
-                if list_type == b"INFO":
-                    src.seek(remaining, os.SEEK_CUR)
-                    if size % 2 == 1:
-                        src.seek(1, os.SEEK_CUR)
+            file_size = len(mm)
+            runs: List[List[int]] = []
+            for cid, off, size in _scan_riff_chunks(mm):
+                if cid == b"LIST" and size >= 4 and mm[off + 8:off + 12] == b"INFO":
                     continue
+                end = min(off + 8 + size + (size & 1), file_size)
+                if runs and runs[-1][1] == off:
+                    runs[-1][1] = end
+                else:
+                    runs.append([off, end])
 
-                dst.write(hdr)
-                dst.write(list_type)
-                _copy_stream(src, dst, remaining)
-                if size % 2 == 1:
-                    pad = src.read(1)
-                    if pad:
-                        dst.write(pad)
-                continue
-
-            dst.write(hdr)
-            _copy_stream(src, dst, size)
-            if size % 2 == 1:
-                pad = src.read(1)
-                if pad:
-                    dst.write(pad)
+        with open(tmp_path, "wb") as dst:
+            dst.write(header)
+            for start, end in runs:
+                src.seek(start)
+                _copy_stream(src, dst, end - start)
 
-        dst.write(info_chunk)
+            dst.write(info_chunk)
 
-        file_size = dst.tell()
-        riff_size = file_size - 8
-        dst.seek(4)
-        dst.write(struct.pack("<I", riff_size))
+            file_size = dst.tell()
+            riff_size = file_size - 8
+            dst.seek(4)
+            dst.write(struct.pack("<I", riff_size))
 
     os.replace(tmp_path, wav_path)
 
 
-def _write_riff_info_tags_for_windows(wav_path: str, clip: Dict[str, Any]) -> None:
-    title = str(clip.get("title", "") or "")
-    album = str(clip.get("playlist", "") or "")
-    track = str(clip.get("rel_idx", "") or "")
-    genre = str(clip.get("tags", "") or "")
-    created = clip.get("created")
-    date = format_created(created) if created else ""
+def _replace_riff_info_chunk(wav_path: str, info_chunk: bytes) -> None:
+    # When there is no INFO chunk, or INFO is already at the tail, the new chunk is
+    # written in place. Only an INFO chunk in the middle needs the full rewrite.
+    cut: Optional[int] = None
+    with open(wav_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mm = None  # empty file
+        if mm is not None:
+            # The map is closed before the file is resized (required on Windows)
+            with mm:
+                file_size = len(mm)
+                if file_size >= 12 and mm[0:4] == b"RIFF" and mm[8:12] == b"WAVE":
+                    chunks = _scan_riff_chunks(mm)
+                    is_info = [
+                        cid == b"LIST" and size >= 4 and mm[off + 8:off + 12] == b"INFO"
+                        for cid, off, size in chunks
+                    ]
+                    keep = len(chunks)
+                    while keep and is_info[keep - 1]:
+                        keep -= 1
+                    if not any(is_info[:keep]):
+                        if keep < len(chunks):
+                            cut = chunks[keep][1]
+                        elif chunks:
+                            _, off, size = chunks[-1]
+                            cut = off + 8 + size + (size & 1)
+                        else:
+                            cut = 12
+                        if cut > file_size:
+                            cut = None  # last chunk is truncated; let the rewrite handle it
+
+    if cut is None:
+        _rewrite_wav_remove_info_and_append(wav_path, info_chunk)
+        return
+
+    with open(wav_path, "r+b") as f:
+        f.truncate(cut)
+        f.seek(cut)
+        f.write(info_chunk)
+        f.seek(4)
+        f.write(struct.pack("<I", cut + len(info_chunk) - 8))
 
-    clip_id = (str(clip.get("id") or "")).strip()
-    base_comment = str(clip.get("gpt", "") or "")
+
+def _write_riff_info_tags_for_windows(wav_path: str, clip: Clip) -> None:
+    title = _s(clip.title)
+    album = _s(clip.playlist)
+    track = _s(clip.rel_idx)
+    genre = _s(clip.tags)
+    created = clip.created
+    date = format_created(str(created)) if created else ""
+
+    clip_id = _s(clip.id).strip()
+    base_comment = _s(clip.gpt)
     parts: List[str] = []
     if base_comment:
         parts.append(base_comment)
     if clip_id:
         parts.append(f"ID: {clip_id}")
-    if clip.get("weight") is not None:
-        parts.append(f"Weight: {clip['weight']}")
-    if clip.get("creativity") is not None:
-        parts.append(f"Creativity: {clip['creativity']}")
+    if clip.weight is not None:
+        parts.append(f"Weight: {clip.weight}")
+    if clip.creativity is not None:
+        parts.append(f"Creativity: {clip.creativity}")
     comment = " | ".join([p for p in parts if p])
 
     info = {
@@ -1135,10 +1499,10 @@ def _write_riff_info_tags_for_windows(wav_path: str, clip: Dict[str, Any]) -> No
     }
 
     chunk = _make_riff_info_chunk(info)
-    _rewrite_wav_remove_info_and_append(wav_path, chunk)
+    _replace_riff_info_chunk(wav_path, chunk)
 
 
-def embed_tags_full_rewrite_wav(wav_path: str, clip: Dict[str, Any], img_path: Optional[str]):
+def embed_tags_full_rewrite_wav(wav_path: str, clip: Clip, img_path: Optional[str]):
     if not WAVE_AVAILABLE:
         print("[WAVTAG] mutagen.wave not available; cannot tag WAV.", file=sys.stderr)
         return
@@ -1158,6 +1522,7 @@ def embed_tags_full_rewrite_wav(wav_path: str, clip: Dict[str, Any], img_path: O
             except Exception:
                 id3 = ID3()
 
+        id3.clear()
         _populate_id3_common(id3, clip, img_path)
 
         try:
@@ -1177,39 +1542,33 @@ def embed_tags_full_rewrite_wav(wav_path: str, clip: Dict[str, Any], img_path: O
 
     except Exception as e:
         print(f"[WAVTAG] Failed tagging WAV {wav_path}: {e}", file=sys.stderr)
-        print(traceback.format_exc(), file=sys.stderr)
+        if DEBUG_TRACEBACKS:
+            print(traceback.format_exc(), file=sys.stderr)
 
 
 # ===================== Retag: fill missing only; preserve timestamps =====================
 
-def _get_id_wxxx_frame(id3: ID3):
+def _index_id_frames(id3: ID3) -> Dict[str, Any]:
+    # First WXXX/TXXX frame with desc "ID" (case/space-insensitive), in one pass over the tag
+    out: Dict[str, Any] = {}
     try:
-        for fr in id3.getall("WXXX"):
-            try:
-                if str(fr.desc).strip().lower() == "id":
-                    return fr
-            except Exception:
-                pass
-    except Exception:
-        pass
-    return None
-
-
-def _get_id_txxx_frame(id3: ID3):
-    try:
-        for fr in id3.getall("TXXX"):
+        for fr in id3.values():
+            fid = getattr(fr, "FrameID", "")
+            if fid not in ("WXXX", "TXXX") or fid in out:
+                continue
             try:
                 if str(fr.desc).strip().lower() == "id":
-                    return fr
+                    out[fid] = fr
             except Exception:
                 pass
     except Exception:
         pass
-    return None
+    return out
 
 
-def retag_mp3_fill_missing_preserve_timestamps(mp3_path: str, clip_id: str) -> bool:
-    if not clip_id or not os.path.exists(mp3_path):
+def retag_mp3_fill_missing_preserve_timestamps(mp3_path: str, clip_id: str, *, known_has_id: bool = False) -> bool:
+    # known_has_id: the directory scan already saw both ID frames, nothing to add
+    if known_has_id or not clip_id or not os.path.exists(mp3_path):
         return False
 
     st = os.stat(mp3_path)
@@ -1222,10 +1581,11 @@ def retag_mp3_fill_missing_preserve_timestamps(mp3_path: str, clip_id: str) -> b
         except ID3NoHeaderError:
             id3 = ID3()
 
-        if _get_id_wxxx_frame(id3) is None:
+        frames = _index_id_frames(id3)
+        if "WXXX" not in frames:
             id3.add(WXXX(encoding=3, desc="ID", url=clip_id))
             changed = True
-        if _get_id_txxx_frame(id3) is None:
+        if "TXXX" not in frames:
             id3.add(TXXX(encoding=3, desc="ID", text=[clip_id]))
             changed = True
 
@@ -1280,6 +1640,123 @@ def retag_flac_fill_missing_preserve_timestamps(flac_path: str, clip_id: str) ->
 
 # ===================== Duplicate detection by ID =====================
 
+_ID3_TEXT_ENCODINGS = ("latin-1", "utf-16", "utf-16-be", "utf-8")
+
+
+def _id3_split_terminated(enc: int, data: bytes) -> Tuple[bytes, bytes]:
+    # UTF-16 strings end in an aligned double null, the others in a single null
+    if enc in (1, 2):
+        i = 0
+        while True:
+            i = data.find(b"\x00\x00", i)
+            if i < 0:
+                return data, b""
+            if i % 2 == 0:
+                return data[:i], data[i + 2:]
+            i += 1
+    i = data.find(b"\x00")
+    if i < 0:
+        return data, b""
+    return data[:i], data[i + 1:]
+
+
+def _id3_decode_values(enc: int, data: bytes) -> str:
+    vals: List[str] = []
+    while data:
+        v, data = _id3_split_terminated(enc, data)
+        vals.append(v.decode(_ID3_TEXT_ENCODINGS[enc]))
+    return " ".join(vals)
+
+
+def _fast_mp3_id_scan(mp3_path: str) -> Tuple[bool, Optional[str], bool]:
+    """
+    Finds the clip ID by walking the ID3v2 frame headers and reading only the
+    WXXX/TXXX/TCOM bodies; cover art and every other frame are seeked past.
+    Returns (handled, clip_id, has_id_frames); has_id_frames means both a WXXX:ID
+    and a TXXX:ID frame exist, i.e. retag would have nothing to add.
+    handled is False for tags this reader does not cover (v2.2, unsynchronisation,
+    extended header, compressed/encrypted frames, frames that don't line up) so
+    the caller can fall back to mutagen.
+    """
+    try:
+        with open(mp3_path, "rb") as f:
+            hdr = f.read(10)
+            if len(hdr) < 10 or hdr[:3] != b"ID3":
+                return True, None, False
+            major, flags = hdr[3], hdr[5]
+            if major not in (3, 4) or flags & 0xC0 or any(b & 0x80 for b in hdr[6:10]):
+                return False, None, False
+            end = 10 + ((hdr[6] << 21) | (hdr[7] << 14) | (hdr[8] << 7) | hdr[9])
+            bad_flags = 0x4F if major == 4 else 0xE0
+
+            wxxx_id: Optional[str] = None
+            txxx_id: Optional[str] = None
+            tcom_id: Optional[str] = None
+            tcom_seen = has_wxxx = has_txxx = False
+            off = 10
+            while off + 10 <= end:
+                fh = f.read(10)
+                if len(fh) < 10:
+                    return False, None, False
+                fid = fh[:4]
+                if fid[0] == 0:
+                    break  # padding
+                if not (fid.isalnum() and fid == fid.upper()):
+                    return False, None, False
+
+                if major == 4:
+                    if any(b & 0x80 for b in fh[4:8]):
+                        return False, None, False
+                    size = (fh[4] << 21) | (fh[5] << 14) | (fh[6] << 7) | fh[7]
+                else:
+                    size = struct.unpack_from(">I", fh, 4)[0]
+                off += 10 + size
+                if off > end:
+                    return False, None, False
+
+                if fid not in (b"WXXX", b"TXXX", b"TCOM") or (fid == b"TCOM" and tcom_seen):
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+                if fh[9] & bad_flags:
+                    return False, None, False
+                body = f.read(size)
+                if len(body) < size:
+                    return False, None, False
+                if not body:
+                    continue
+                enc = body[0]
+                if enc > 3:
+                    return False, None, False
+
+                if fid == b"TCOM":
+                    tcom_seen = True
+                    m = UUID_RE.search(_id3_decode_values(enc, body[1:]).strip())
+                    if m:
+                        tcom_id = m.group(0)
+                    continue
+
+                desc_b, rest = _id3_split_terminated(enc, body[1:])
+                if desc_b.decode(_ID3_TEXT_ENCODINGS[enc]).strip().lower() != "id":
+                    continue
+                if fid == b"WXXX":
+                    has_wxxx = True
+                    url = rest.split(b"\x00", 1)[0].decode("latin-1").strip()
+                    if wxxx_id is None and _looks_like_uuid(url) and UUID_RE.fullmatch(url):
+                        wxxx_id = url
+                else:
+                    has_txxx = True
+                    if txxx_id is None:
+                        m = UUID_RE.search(_id3_decode_values(enc, rest).strip())
+                        if m:
+                            txxx_id = m.group(0)
+
+            return True, wxxx_id or txxx_id or tcom_id, has_wxxx and has_txxx
+    except OSError:
+        return True, None, False
+    except Exception:
+        return False, None, False
+
+
 def mp3_extract_clip_id(mp3_path: str) -> Optional[str]:
     try:
         id3 = ID3(mp3_path)
@@ -1291,7 +1768,7 @@ def mp3_extract_clip_id(mp3_path: str) -> Optional[str]:
             try:
                 if str(fr.desc).strip().lower() == "id":
                     val = str(fr.url).strip()
-                    if UUID_RE.fullmatch(val):
+                    if _looks_like_uuid(val) and UUID_RE.fullmatch(val):
                         return val
             except Exception:
                 pass
@@ -1352,66 +1829,188 @@ def flac_extract_clip_id(flac_path: str) -> Optional[str]:
     return None
 
 
-def scan_audio_dir_ids(audio_dir: str) -> Tuple[Dict[str, Dict[str, Optional[str]]], Dict[str, int]]:
+def _scan_mp3_clip_id(mp3_path: str) -> Tuple[Optional[str], bool]:
+    # (clip_id, has_id_frames); mutagen only runs for tags the fast scan can't read
+    handled, cid, has_id_frames = _fast_mp3_id_scan(mp3_path)
+    if handled:
+        return cid, has_id_frames
+    return mp3_extract_clip_id(mp3_path), False
+
+
+def _scan_flac_clip_id(flac_path: str) -> Tuple[Optional[str], bool]:
+    return flac_extract_clip_id(flac_path), False
+
+
+_ID_CACHE: Optional[Dict[str, Dict[str, Any]]] = None
+_ID_CACHE_DIRTY = False
+
+
+def _load_id_cache() -> Dict[str, Dict[str, Any]]:
+    global _ID_CACHE
+    if _ID_CACHE is None:
+        try:
+            data = _json_loads(ID_CACHE_FILE.read_bytes())
+            _ID_CACHE = data if isinstance(data, dict) else {}
+        except Exception:
+            _ID_CACHE = {}
+    return _ID_CACHE
+
+
+def _save_id_cache() -> None:
+    global _ID_CACHE_DIRTY
+    if _ID_CACHE is None or not _ID_CACHE_DIRTY:
+        return
+    try:
+        PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = ID_CACHE_FILE.with_suffix(".tmp")
+        tmp.write_bytes(_json_dumps(_ID_CACHE))
+        os.replace(tmp, ID_CACHE_FILE)
+        _ID_CACHE_DIRTY = False
+    except Exception as e:
+        print(f"[DUP] Could not write ID cache: {e}", file=sys.stderr)
+
+
+def _cached_clip_id(path: str, extract, entry: Optional[os.DirEntry] = None) -> Tuple[Optional[str], bool]:
+    """
+    Returns (clip_id, has_id_frames) for an audio file, re-reading its tags only when
+    the file's mtime/size differ from the cached entry. Only files that had an ID are
+    cached, so untagged files are always re-read (retag keeps their mtime).
+    Safe to call from the scan pool: each call only touches its own path's key.
+    A DirEntry from the directory walk supplies the stat without another syscall on Windows.
+    """
+    global _ID_CACHE_DIRTY
+    cache = _load_id_cache()
+    try:
+        st = entry.stat() if entry is not None else os.stat(path)
+    except OSError:
+        return None, False
+
+    key = os.path.normcase(os.path.abspath(path))
+    ent = cache.get(key)
+    if ent and ent.get("mtime_ns") == st.st_mtime_ns and ent.get("size") == st.st_size:
+        return ent.get("id"), bool(ent.get("tagged"))
+
+    cid, tagged = extract(path)
+    if cid:
+        cache[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "id": cid, "tagged": tagged}
+        _ID_CACHE_DIRTY = True
+    elif ent is not None:
+        del cache[key]
+        _ID_CACHE_DIRTY = True
+    return cid, tagged
+
+
+_VERSION_SUFFIX_RE = re.compile(r"^(.*)\s+V(\d+)$", re.IGNORECASE)
+
+
+def _split_version_suffix(stem: str) -> Optional[Tuple[str, int]]:
+    # "Title V3" -> ("Title", 3). The common " V<digits>" form is split directly;
+    # the regex only sees stems with a lowercase v or other whitespace.
+    i = stem.rfind(" V")
+    if i >= 0 and stem[i + 2:].isdecimal() and "\n" not in stem:
+        return stem[:i], int(stem[i + 2:])
+    m = _VERSION_SUFFIX_RE.match(stem)
+    if not m:
+        return None
+    try:
+        return m.group(1), int(m.group(2))
+    except Exception:
+        return None
+
+
+def scan_audio_dir_ids(audio_dir: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int], Set[str]]:
     """
     Returns:
-      existing_by_id: dict clip_id -> {"base": stem, "mp3": path|None, "flac": path|None}
+      existing_by_id: dict clip_id -> {"base": stem, "mp3": path|None, "flac": path|None,
+                                       "mp3_tagged": bool (MP3 already has WXXX+TXXX ID frames)}
       version_seed: dict raw_title -> max_version_seen (from existing "RAW Vn")
+      names: normcased names of every entry in audio_dir (existence checks by set lookup)
     """
-    existing_by_id: Dict[str, Dict[str, Optional[str]]] = {}
+    global _ID_CACHE_DIRTY
+    existing_by_id: Dict[str, Dict[str, Any]] = {}
     stems: List[str] = []
+    names: Set[str] = set()
 
     p = Path(audio_dir)
     if not p.exists():
-        return existing_by_id, {}
+        return existing_by_id, {}, names
 
     try:
-        for f in p.glob("*.mp3"):
-            cid = mp3_extract_clip_id(str(f))
+        # One directory walk; normcase keeps glob's case rules (insensitive on Windows only)
+        mp3s: List[os.DirEntry] = []
+        flacs: List[os.DirEntry] = []
+        with os.scandir(audio_dir) as it:
+            for de in it:
+                name = os.path.normcase(de.name)
+                names.add(name)
+                if name.endswith(".mp3"):
+                    mp3s.append(de)
+                elif name.endswith(".flac"):
+                    flacs.append(de)
+
+        # Forget cached files of this directory that were deleted, renamed or moved
+        cache = _load_id_cache()
+        dir_key = os.path.normcase(os.path.abspath(audio_dir))
+        seen = {os.path.normcase(os.path.abspath(de.path)) for de in mp3s + flacs}
+        stale = [k for k in cache if os.path.dirname(k) == dir_key and k not in seen]
+        for k in stale:
+            del cache[k]
+        if stale:
+            _ID_CACHE_DIRTY = True
+
+        # Tag reads overlap in the pool; results are reduced here in walk order
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+            mp3_ids = list(ex.map(lambda de: _cached_clip_id(de.path, _scan_mp3_clip_id, de), mp3s))
+            flac_ids = list(ex.map(lambda de: _cached_clip_id(de.path, _scan_flac_clip_id, de), flacs))
+
+        for de, (cid, tagged) in zip(mp3s, mp3_ids):
             if cid:
-                existing_by_id.setdefault(cid, {"base": f.stem, "mp3": str(f), "flac": None})
-                stems.append(f.stem)
+                stem = os.path.splitext(de.name)[0]
+                existing_by_id.setdefault(cid, {"base": stem, "mp3": de.path, "flac": None, "mp3_tagged": tagged})
+                stems.append(stem)
 
-        for f in p.glob("*.flac"):
-            cid = flac_extract_clip_id(str(f))
+        for de, (cid, _) in zip(flacs, flac_ids):
             if cid:
-                entry = existing_by_id.setdefault(cid, {"base": f.stem, "mp3": None, "flac": str(f)})
-                entry["flac"] = str(f)
-                stems.append(f.stem)
+                stem = os.path.splitext(de.name)[0]
+                entry = existing_by_id.setdefault(cid, {"base": stem, "mp3": None, "flac": de.path, "mp3_tagged": False})
+                entry["flac"] = de.path
+                stems.append(stem)
 
     except Exception as e:
         print(f"[DUP] scan_audio_dir_ids failed: {e}", file=sys.stderr)
         print(traceback.format_exc(), file=sys.stderr)
 
+    _save_id_cache()
+
     version_seed: Dict[str, int] = {}
-    mver = re.compile(r"^(.*)\s+V(\d+)$", re.IGNORECASE)
     for stem in stems:
-        m = mver.match(stem)
-        if not m:
-            continue
-        raw = m.group(1)
-        try:
-            v = int(m.group(2))
-        except Exception:
+        parsed = _split_version_suffix(stem)
+        if not parsed:
             continue
+        raw, v = parsed
         prev = version_seed.get(raw, 0)
         if v > prev:
             version_seed[raw] = v
 
-    return existing_by_id, version_seed
+    return existing_by_id, version_seed, names
 
 
-def unique_clips_by_id(clips: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    seen: Set[str] = set()
-    for c in clips:
-        cid = str(c.get("id") or "").strip()
-        if cid and cid in seen:
-            continue
-        if cid:
-            seen.add(cid)
-        out.append(c)
-    return out
+def _dir_names(path: str) -> Set[str]:
+    # Normcased entry names of a directory (empty if it is missing or unreadable)
+    try:
+        with os.scandir(path) as it:
+            return {os.path.normcase(de.name) for de in it}
+    except OSError:
+        return set()
+
+
+def unique_clips_by_id(clips: List[Clip]) -> List[Clip]:
+    # First clip per ID wins; clips without an ID are keyed by position so they
+    # are all kept, in their original order.
+    out: Dict[Any, Clip] = {}
+    for i, c in enumerate(clips):
+        out.setdefault(_s(c.id).strip() or i, c)
+    return list(out.values())
 
 
 # ===================== XLSX index helpers (preserve thumbnails) =====================
@@ -1424,8 +2023,62 @@ def header_col_map(ws) -> Dict[str, int]:
     return out
 
 
-def _open_wb_and_sheet(xlsx_path: str, sheet_name: str):
-    wb = load_workbook(xlsx_path)
+def _set_index_row_height(ws) -> None:
+    # Every index row is 30pt tall (fits the 40px thumbnail); one sheet default
+    # instead of a RowDimension entry per row.
+    ws.sheet_format.defaultRowHeight = 30
+    ws.sheet_format.customHeight = True
+
+
+def _index_row_values(clip: Clip) -> List[Any]:
+    # One index row in HEADERS order; the Thumbnail column (F) is left for the image
+    return [
+        clip.master_idx,
+        clip.rel_idx,
+        clip.playlist,
+        clip.index_title or clip.title,
+        clip.duration,
+        None,
+        clip.tags,
+        clip.gpt,
+        clip.lyrics or clip.prompt,
+        clip.id,
+        format_created(clip.created or ""),
+        clip.model,
+        clip.model_name,
+        clip.type,
+        clip.weight if clip.weight is not None else "N/A",
+        clip.creativity if clip.creativity is not None else "N/A",
+        clip.img,
+        clip.aud,
+        clip.vid,
+    ]
+
+
+def _index_thumb_image(clip: Clip, cache: Dict[Any, XLImage]) -> Optional[XLImage]:
+    # Prefer the PNG bytes kept from download_image; fall back to an existing _thumbs file.
+    # Rows sharing the same art reuse one probed XLImage; each row gets a shallow copy
+    # so it can carry its own anchor (and its own stream, since save closes it).
+    png = clip.thumb_png
+    if png:
+        key = png
+    elif clip.thumb_path and os.path.exists(clip.thumb_path):
+        key = clip.thumb_path
+    else:
+        return None
+
+    img = cache.get(key)
+    if img is None:
+        img = XLImage(io.BytesIO(png) if png else key)
+        cache[key] = img
+    img = copy.copy(img)
+    if png:
+        img.ref = io.BytesIO(png)
+    return img
+
+
+def _open_wb_and_sheet(xlsx_path: str, sheet_name: str, read_only: bool = False):
+    wb = load_workbook(xlsx_path, read_only=read_only)
     safe = safe_sheet_name(sheet_name)
     if sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
@@ -1448,132 +2101,165 @@ def update_index_titles_in_place(xlsx_path: str, sheet_name: str, id_to_title: D
     id_col = cols["ID"]
     title_col = cols["Title"]
 
+    # Read both columns as plain value tuples; only touch a Cell when a title changes
+    lo, hi = min(id_col, title_col), max(id_col, title_col)
+    id_i, title_i = id_col - lo, title_col - lo
+
     changed = False
-    for r in range(2, ws.max_row + 1):
-        v = ws.cell(row=r, column=id_col).value
+    rows = ws.iter_rows(min_row=2, min_col=lo, max_col=hi, values_only=True)
+    for r, vals in enumerate(rows, start=2):
+        v = vals[id_i]
         if v is None:
             continue
-        sid = str(v)
-        if sid in id_to_title:
-            new_title = id_to_title[sid]
-            cell = ws.cell(row=r, column=title_col)
-            if cell.value != new_title:
-                cell.value = new_title
-                changed = True
+        new_title = id_to_title.get(str(v))
+        if new_title is not None and vals[title_i] != new_title:
+            ws.cell(row=r, column=title_col).value = new_title
+            changed = True
 
     if changed:
         wb.save(xlsx_path)
     return changed
 
 
-def append_missing_rows_preserve_thumbs(xlsx_path: str, sheet_name: str, clips: List[Dict[str, Any]]) -> bool:
+def append_missing_rows_preserve_thumbs(xlsx_path: str, sheet_name: str, clips: List[Clip]) -> bool:
     if not os.path.exists(xlsx_path):
         return False
-    wb, ws = _open_wb_and_sheet(xlsx_path, sheet_name)
 
-    cols = header_col_map(ws)
-    if "ID" not in cols:
-        return False
-    id_col = cols["ID"]
+    # The ID check runs on a streaming read-only load; the full load (cells, styles,
+    # images) is only paid when there is actually something to append.
+    wb_ro, ws_ro = _open_wb_and_sheet(xlsx_path, sheet_name, read_only=True)
+    try:
+        cols = header_col_map(ws_ro)
+        if "ID" not in cols:
+            return False
+        id_col = cols["ID"]
 
-    existing_ids = set()
-    for r in range(2, ws.max_row + 1):
-        v = ws.cell(row=r, column=id_col).value
-        if v is not None:
-            existing_ids.add(str(v))
+        existing_ids = {
+            str(v)
+            for (v,) in ws_ro.iter_rows(min_row=2, min_col=id_col, max_col=id_col, values_only=True)
+            if v is not None
+        }
+    finally:
+        wb_ro.close()
 
-    to_add = [c for c in clips if c.get("id") and str(c["id"]) not in existing_ids]
+    to_add = [c for c in clips if c.id and _s(c.id) not in existing_ids]
     if not to_add:
         return False
 
+    wb, ws = _open_wb_and_sheet(xlsx_path, sheet_name)
+    _set_index_row_height(ws)
+
+    # ws.append() writes directly below the last row; count instead of re-reading max_row
+    row = ws.max_row
+    thumbs: Dict[Any, XLImage] = {}
     for c in to_add:
-        ws.append([
-            c.get("master_idx"),
-            c.get("rel_idx"),
-            c.get("playlist"),
-            c.get("index_title") or c.get("title"),
-            c.get("duration"),
-            None,
-            c.get("tags"),
-            c.get("gpt"),
-            c.get("lyrics") or c.get("prompt"),
-            c.get("id"),
-            format_created(c.get("created")),
-            c.get("model"),
-            c.get("model_name"),
-            c.get("type"),
-            c.get("weight") if c.get("weight") is not None else "N/A",
-            c.get("creativity") if c.get("creativity") is not None else "N/A",
-            c.get("img"),
-            c.get("aud"),
-            c.get("vid"),
-        ])
-        row = ws.max_row
-        try:
-            ws.row_dimensions[row].height = 30
-        except Exception:
-            pass
+        row += 1
+        ws.append(_index_row_values(c))
 
-        thumb = c.get("thumb_path")
-        if thumb and os.path.exists(thumb):
-            try:
-                ws.add_image(XLImage(thumb), f"F{row}")
-            except Exception as e:
-                print(f"[XLSX] Failed to add thumbnail for row {row}: {e}", file=sys.stderr)
+        try:
+            img = _index_thumb_image(c, thumbs)
+            if img:
+                ws.add_image(img, f"F{row}")
+        except Exception as e:
+            print(f"[XLSX] Failed to add thumbnail for row {row}: {e}", file=sys.stderr)
 
     wb.save(xlsx_path)
     return True
 
 
-def create_index_xlsx(clips: List[Dict[str, Any]], xlsx_path: str, sheet_title: str):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = safe_sheet_name(sheet_title)
-    ws.append(HEADERS)
+def _create_index_xlsx_xlsxwriter(clips: List[Clip], xlsx_path: str, sheet_title: str):
+    # constant_memory flushes each row to disk once the next one starts. Strings are
+    # written verbatim like openpyxl does (no formula/URL auto-conversion).
+    wb = xlsxwriter.Workbook(xlsx_path, {
+        "constant_memory": True,
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+    })
+    ws = wb.add_worksheet(safe_sheet_name(sheet_title))
+    ws.set_default_row(30)
+    ws.write_row(0, 0, HEADERS)
 
-    for clip in clips:
-        clip["_row"] = ws.max_row + 1
-        ws.append([
-            clip.get("master_idx"),
-            clip.get("rel_idx"),
-            clip.get("playlist"),
-            clip.get("index_title") or clip.get("title"),
-            clip.get("duration"),
-            None,
-            clip.get("tags"),
-            clip.get("gpt"),
-            clip.get("lyrics") or clip.get("prompt"),
-            clip.get("id"),
-            format_created(clip.get("created")),
-            clip.get("model"),
-            clip.get("model_name"),
-            clip.get("type"),
-            clip.get("weight") if clip.get("weight") is not None else "N/A",
-            clip.get("creativity") if clip.get("creativity") is not None else "N/A",
-            clip.get("img"),
-            clip.get("aud"),
-            clip.get("vid"),
-        ])
+    for r, clip in enumerate(clips, start=1):
+        ws.write_row(r, 0, _index_row_values(clip))
 
-    for r in range(1, ws.max_row + 1):
         try:
-            ws.row_dimensions[r].height = 30
-        except Exception:
-            pass
+            opts: Dict[str, Any] = {"object_position": 2}
+            if clip.thumb_png:
+                opts["image_data"] = io.BytesIO(clip.thumb_png)
+                ws.insert_image(r, 5, f"{clip.id or r}.png", opts)
+            elif clip.thumb_path and os.path.exists(clip.thumb_path):
+                ws.insert_image(r, 5, clip.thumb_path, opts)
+        except Exception as e:
+            print(f"[XLSX] Failed to add thumbnail: {e}", file=sys.stderr)
+
+    wb.close()
+
+
+def create_index_xlsx(clips: List[Clip], xlsx_path: str, sheet_title: str):
+    if XLSXWRITER_AVAILABLE:
+        _create_index_xlsx_xlsxwriter(clips, xlsx_path, sheet_title)
+        return
 
+    # Write-only workbook: rows are streamed to the sheet XML as they are appended
+    # instead of being kept as Cell objects until save; images are written on save.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=safe_sheet_name(sheet_title))
+    _set_index_row_height(ws)
+
+    ws.append(HEADERS)
+
+    row = 1
+    thumbs: Dict[Any, XLImage] = {}
     for clip in clips:
-        thumb = clip.get("thumb_path")
-        if thumb and os.path.exists(thumb):
-            try:
-                ws.add_image(XLImage(thumb), f"F{clip['_row']}")
-            except Exception as e:
-                print(f"[XLSX] Failed to add thumbnail: {e}", file=sys.stderr)
+        row += 1
+        ws.append(_index_row_values(clip))
+
+        try:
+            img = _index_thumb_image(clip, thumbs)
+            if img:
+                ws.add_image(img, f"F{row}")
+        except Exception as e:
+            print(f"[XLSX] Failed to add thumbnail: {e}", file=sys.stderr)
 
     wb.save(xlsx_path)
 
 
 # ===================== Playwright WAV UI automation =====================
 
+class _PlaywrightThread:
+    """
+    Runs callables on one long-lived daemon thread. Playwright's sync API is bound to the
+    thread that started it, so this is what lets a browser context outlive a single run.
+    """
+
+    def __init__(self):
+        self._jobs: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="playwright", daemon=True)
+                self._thread.start()
+        fut: Future = Future()
+        self._jobs.put((fut, fn, args))
+        return fut
+
+    def call(self, fn, *args, timeout: Optional[float] = None):
+        return self.submit(fn, *args).result(timeout)
+
+    def _run(self):
+        while True:
+            fut, fn, args = self._jobs.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn(*args))
+            except BaseException as e:
+                fut.set_exception(e)
+
+
 def pw_wait_until(fn, timeout_s: float = 15.0, poll_s: float = 0.25) -> bool:
     start = time.time()
     while time.time() - start < timeout_s:
@@ -1594,14 +2280,28 @@ def pw_download_entry_visible(page: "Page") -> bool:
         return False
 
 
+PW_MORE_MENU_SELECTORS = (
+    'button[aria-label="More Menu Options"]',
+    'button[title="More Menu Options"]',
+    'button[aria-label*="More" i]',
+    f'button:has(svg path[d^="{MORE_MENU_PATH_PREFIX}"])',
+    f'[role="button"]:has(svg path[d^="{MORE_MENU_PATH_PREFIX}"])',
+)
+_PW_MORE_MENU_VISIBLE = ", ".join(f"{sel}:visible" for sel in PW_MORE_MENU_SELECTORS)
+
+
 def pw_find_more_menu_candidates(page: "Page"):
-    return [
-        page.locator('button[aria-label="More Menu Options"]'),
-        page.locator('button[title="More Menu Options"]'),
-        page.locator('button[aria-label*="More" i]'),
-        page.locator(f'button:has(svg path[d^="{MORE_MENU_PATH_PREFIX}"])'),
-        page.locator(f'[role="button"]:has(svg path[d^="{MORE_MENU_PATH_PREFIX}"])'),
-    ]
+    return [page.locator(sel) for sel in PW_MORE_MENU_SELECTORS]
+
+
+def pw_wait_for_page_ready(page: "Page", timeout_ms: int = PW_PAGE_READY_TIMEOUT_MS) -> bool:
+    # The page has hydrated once any song menu button renders; returns False on timeout and
+    # leaves the fallbacks in pw_ensure_menu_open to deal with it
+    try:
+        page.locator(_PW_MORE_MENU_VISIBLE).first.wait_for(state="attached", timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
 
 
 def pw_ensure_menu_open(page: "Page") -> None:
@@ -1614,8 +2314,6 @@ def pw_ensure_menu_open(page: "Page") -> None:
     except Exception:
         pass
 
-    page.wait_for_timeout(800)
-
     for cand in pw_find_more_menu_candidates(page):
         try:
             n = cand.count()
@@ -1662,7 +2360,8 @@ def pw_wait_for_modal_download_button_enabled(page: "Page"):
     return dl_btn
 
 
-def pw_trigger_ui_wav_download(page: "Page", per_song_timeout_ms: int = PW_PER_SONG_TIMEOUT_MS):
+def pw_open_wav_download_modal(page: "Page") -> None:
+    # Opening the "Download WAV Audio" modal is what makes Suno start preparing the file
     pw_ensure_menu_open(page)
 
     download_btn = page.locator('button.context-menu-button:has-text("Download")').first
@@ -1683,6 +2382,8 @@ def pw_trigger_ui_wav_download(page: "Page", per_song_timeout_ms: int = PW_PER_S
         wav_entry.wait_for(state="visible", timeout=5000)
         wav_entry.click()
 
+
+def pw_collect_wav_download(page: "Page", per_song_timeout_ms: int = PW_PER_SONG_TIMEOUT_MS):
     dl_file_btn = pw_wait_for_modal_download_button_enabled(page)
 
     with page.expect_download(timeout=per_song_timeout_ms) as dlinfo:
@@ -1691,6 +2392,7 @@ def pw_trigger_ui_wav_download(page: "Page", per_song_timeout_ms: int = PW_PER_S
     return dlinfo.value
 
 
+
 def pw_login_gate_detected(page: "Page") -> bool:
     try:
         page.wait_for_timeout(600)
@@ -1717,8 +2419,22 @@ class SunoDownloader(tk.Tk):
         self.stop_event = threading.Event()
         self._worker_thread = None
 
+        # WAV browser, kept open between runs; only touched on the Playwright thread
+        self._pw_runner = _PlaywrightThread()
+        self._pw = None
+        self._pw_context: Optional["BrowserContext"] = None
+        self._pw_staging_dir: Optional[Path] = None
+        self._closing = False
+
         self._log_line_count = 0
 
+        # Last option checkbox values applied by update_option_states
+        self._option_state_key: Optional[Tuple[bool, ...]] = None
+
+        # (done, total) published by the worker; _progress_tick renders it at most every 100 ms
+        self._progress_state = (0, 0)
+        self._progress_shown = (0, 0)
+
         tk.Label(
             self,
             text="Enter playlist/clip URLs or IDs (one per line):",
@@ -1913,6 +2629,7 @@ class SunoDownloader(tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.update_option_states()
         self.after(50, self._drain_log_queue)
+        self.after(100, self._progress_tick)
 
     # ---------- session save/load ----------
 
@@ -1922,15 +2639,15 @@ class SunoDownloader(tk.Tk):
             "saved_at": datetime.now().isoformat(timespec="seconds"),
             "inputs": self.text_box.get("1.0", tk.END).rstrip("\n"),
             "options": {
-                "audio": bool(self.audio_var.get()),
-                "artwork": bool(self.artwork_var.get()),
-                "lyrics": bool(self.lyrics_var.get()),
-                "genres": bool(self.genres_var.get()),
-                "prompts": bool(self.prompts_var.get()),
-                "playlist_index": bool(self.pl_idx_var.get()),
-                "master_index": bool(self.master_idx_var.get()),
-                "wav": bool(self.wav_var.get()),
-                "retag_only": bool(self.retag_only_var.get()),
+                "audio": self.audio_var.get(),
+                "artwork": self.artwork_var.get(),
+                "lyrics": self.lyrics_var.get(),
+                "genres": self.genres_var.get(),
+                "prompts": self.prompts_var.get(),
+                "playlist_index": self.pl_idx_var.get(),
+                "master_index": self.master_idx_var.get(),
+                "wav": self.wav_var.get(),
+                "retag_only": self.retag_only_var.get(),
             },
         }
 
@@ -1950,7 +2667,7 @@ class SunoDownloader(tk.Tk):
 
         payload = self._session_payload()
         try:
-            path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+            path.write_bytes(_json_dumps(payload, indent=True))
             self._set_status(f"Session saved: {path.name}")
             print(f"[SESSION] Saved: {path}")
         except Exception as e:
@@ -1972,7 +2689,7 @@ class SunoDownloader(tk.Tk):
             return
 
         try:
-            data = json.loads(Path(path).read_text(encoding="utf-8", errors="replace"))
+            data = _json_loads(Path(path).read_bytes())
             inputs = str(data.get("inputs", "") or "")
             opts = data.get("options", {}) or {}
 
@@ -2008,16 +2725,20 @@ class SunoDownloader(tk.Tk):
         if not chrome_path or not chrome_path.exists():
             return
 
-        _spawn_watcher_detached()
-        launch_chrome_login_via_powershell(chrome_path)
-
         try:
             self.stop_event.set()
             self.pause_event.clear()
         except Exception:
             pass
 
-        _hard_exit_soon(250)
+        def _launch():
+            _spawn_watcher_detached()
+            launch_chrome_login_via_powershell(chrome_path)
+            _hard_exit_soon(250)
+
+        # The login Chrome needs the profile, so the kept-open WAV browser has to let go of it
+        self.login_btn.config(state=tk.DISABLED)
+        self._pw_release(_launch)
 
     # ---------- UI helpers ----------
 
@@ -2025,6 +2746,23 @@ class SunoDownloader(tk.Tk):
         print(f"[STATUS] {text}")
         self.after(0, lambda t=text: self.status_label.config(text=t))
 
+    def _set_progress(self, done: int, total: int):
+        # Safe from any thread: a single tuple store, picked up by the next _progress_tick
+        self._progress_state = (done, total)
+
+    def _progress_tick(self):
+        try:
+            state = self._progress_state
+            if state != self._progress_shown:
+                done, total = state
+                self.progress.config(maximum=max(total, 1), value=done)
+                self.progress_label.config(text=f"{done}/{total}")
+                self._progress_shown = state
+        except Exception:
+            pass
+        finally:
+            self.after(100, self._progress_tick)
+
     def _set_running_controls(self, running: bool):
         self.btn_pause.config(state=(tk.NORMAL if running else tk.DISABLED))
         self.btn_stop.config(state=(tk.NORMAL if running else tk.DISABLED))
@@ -2033,41 +2771,49 @@ class SunoDownloader(tk.Tk):
             self.btn_pause.config(text="⏸")
 
     def update_option_states(self):
-        retag = self.retag_only_var.get()
-
-        audio_cb = self.checkbuttons[self._cb_audio]
-        art_cb = self.checkbuttons[self._cb_art]
-        lyr_cb = self.checkbuttons[self._cb_lyrics]
-        gen_cb = self.checkbuttons[self._cb_genres]
-        prm_cb = self.checkbuttons[self._cb_prompts]
-        wav_cb = self.checkbuttons[self._cb_wav]
-
-        if retag:
-            for cb in (audio_cb, art_cb, lyr_cb, gen_cb, prm_cb, wav_cb):
-                cb.config(state=tk.DISABLED)
-            self.wav_var.set(False)
-        else:
-            audio_cb.config(state=tk.NORMAL)
-            for cb in (art_cb, lyr_cb, gen_cb, prm_cb):
-                cb.config(state=tk.NORMAL)
-
-            if PLAYWRIGHT_AVAILABLE:
-                wav_cb.config(state=tk.NORMAL)
-            else:
-                wav_cb.config(state=tk.DISABLED)
-                self.wav_var.set(False)
-
         vars_list = [
             self.audio_var, self.artwork_var,
             self.lyrics_var, self.genres_var, self.prompts_var,
             self.pl_idx_var, self.master_idx_var, self.wav_var,
             self.retag_only_var
         ]
-        for cb, var in zip(self.checkbuttons, vars_list):
-            cb.config(
-                fg=CHECK_TEXT_COLOR if var.get() else DISABLED_COLOR,
-                selectcolor=SELECT_COLOR if var.get() else BG_COLOR
-            )
+
+        retag = self.retag_only_var.get()
+        if self.wav_var.get() and (retag or not PLAYWRIGHT_AVAILABLE):
+            self.wav_var.set(False)
+
+        # Every checkbutton toggle lands here; only widgets whose inputs changed since the
+        # last call are reconfigured (states follow retag, colors follow each var)
+        key = tuple(bool(v.get()) for v in vars_list)
+        prev = self._option_state_key
+        if key == prev:
+            return
+
+        if prev is None or prev[-1] != key[-1]:
+            audio_cb = self.checkbuttons[self._cb_audio]
+            art_cb = self.checkbuttons[self._cb_art]
+            lyr_cb = self.checkbuttons[self._cb_lyrics]
+            gen_cb = self.checkbuttons[self._cb_genres]
+            prm_cb = self.checkbuttons[self._cb_prompts]
+            wav_cb = self.checkbuttons[self._cb_wav]
+
+            if retag:
+                for cb in (audio_cb, art_cb, lyr_cb, gen_cb, prm_cb, wav_cb):
+                    cb.config(state=tk.DISABLED)
+            else:
+                audio_cb.config(state=tk.NORMAL)
+                for cb in (art_cb, lyr_cb, gen_cb, prm_cb):
+                    cb.config(state=tk.NORMAL)
+                wav_cb.config(state=tk.NORMAL if PLAYWRIGHT_AVAILABLE else tk.DISABLED)
+
+        for i, (cb, on) in enumerate(zip(self.checkbuttons, key)):
+            if prev is None or prev[i] != on:
+                cb.config(
+                    fg=CHECK_TEXT_COLOR if on else DISABLED_COLOR,
+                    selectcolor=SELECT_COLOR if on else BG_COLOR
+                )
+
+        self._option_state_key = key
 
     def load_from_file(self):
         path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All files", "*.*")])
@@ -2097,11 +2843,15 @@ class SunoDownloader(tk.Tk):
         self.console_text.insert(tk.END, text)
         self._log_line_count += text.count("\n")
 
-        if self._log_line_count > UI_LOG_MAX_LINES:
-            excess = self._log_line_count - UI_LOG_MAX_LINES
+        # Trim back to UI_LOG_MAX_LINES in one bulk delete once the slack is used up,
+        # instead of shaving a few lines off the top after every insert past the cap
+        if self._log_line_count > UI_LOG_MAX_LINES + UI_LOG_TRIM_SLACK:
             try:
-                self.console_text.delete("1.0", f"{excess + 1}.0")
-                self._log_line_count -= excess
+                newlines = int(self.console_text.index("end-1c").split(".")[0]) - 1
+                excess = newlines - UI_LOG_MAX_LINES
+                if excess > 0:
+                    self.console_text.delete("1.0", f"{excess + 1}.0")
+                self._log_line_count = min(newlines, UI_LOG_MAX_LINES)
             except Exception:
                 self.console_text.delete("1.0", tk.END)
                 self._log_line_count = 0
@@ -2113,13 +2863,13 @@ class SunoDownloader(tk.Tk):
                 pass
 
     def _drain_log_queue(self):
+        # One Text.insert per tick for everything drained, not one per line. Only the Tk
+        # thread takes from the queue, so the qsize() snapshot is all there: no Empty raised.
         try:
-            for _ in range(500):
-                try:
-                    line = UI_LOG_QUEUE.get_nowait()
-                except Exception:
-                    break
-                self._append_console(line)
+            n = min(UI_LOG_QUEUE.qsize(), UI_LOG_MAX_DRAIN)
+            if n:
+                get = UI_LOG_QUEUE.get_nowait
+                self._append_console("".join([get() for _ in range(n)]))
         except Exception:
             pass
         finally:
@@ -2156,120 +2906,238 @@ class SunoDownloader(tk.Tk):
 
     # ---------- WAV downloads ----------
 
-    def download_wavs_in_playwright(self, wav_jobs: List[Dict[str, Any]], base_folder: str):
-        if not PLAYWRIGHT_AVAILABLE:
-            raise RuntimeError("playwright is not installed")
+    def _wav_open_modal(self, page: "Page", job: Dict[str, Any], idx: int, total: int) -> Optional[bool]:
+        """
+        Navigates a tab to the song and opens its WAV download modal so Suno starts preparing it.
+        Returns True when the modal is open, False when skipped (already exists), None when stopped.
+        """
+        song_url = job["song_url"]
+        out_wav = Path(job["out_wav"])
+        out_wav.parent.mkdir(parents=True, exist_ok=True)
+
+        if out_wav.exists():
+            print(f"[WAV] {idx}/{total} SKIP (exists): {out_wav.name}")
+            return False
 
-        chrome_path = ensure_chrome_exe()
-        if not chrome_path or not chrome_path.exists():
-            raise RuntimeError("Chrome not available (chrome.exe not found)")
+        self._set_status(f"WAV: {idx}/{total} opening song page…")
+        print(f"[WAV] {idx}/{total} OPEN: {song_url}")
 
-        PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        page.bring_to_front()
+        page.goto(song_url, wait_until="domcontentloaded")
+        pw_wait_for_page_ready(page)
 
-        staging_dir = Path(base_folder) / "_pw_downloads_tmp"
-        staging_dir.mkdir(parents=True, exist_ok=True)
+        if not self._wait_if_paused_or_stopped():
+            return None
 
-        self._set_status("WAV: launching Chrome (Playwright)…")
+        self._set_status(f"WAV: {idx}/{total} triggering UI download…")
+        pw_open_wav_download_modal(page)
+        return True
 
-        with sync_playwright() as p:  # type: ignore
-            context: "BrowserContext" = p.chromium.launch_persistent_context(
-                user_data_dir=str(PERSIST_PROFILE_DIR),
-                executable_path=str(chrome_path),
-                headless=False,
-                accept_downloads=True,
-                downloads_path=str(staging_dir),
-                args=PW_CHROME_ARGS,
-            )
-            context.set_default_timeout(60_000)
+    def _wav_save(self, page: "Page", job: Dict[str, Any], idx: int, total: int, tag_pool: ThreadPoolExecutor) -> None:
+        out_wav = Path(job["out_wav"])
+
+        self._set_status(f"WAV: {idx}/{total} waiting for download…")
+        page.bring_to_front()
+        download = pw_collect_wav_download(page, per_song_timeout_ms=PW_PER_SONG_TIMEOUT_MS)
+
+        download.save_as(str(out_wav))
+        print(f"[WAV] {idx}/{total} SAVED: {out_wav.name}")
+
+        # Tagging rewrites the whole file; it runs beside the next song's download/navigation
+        clip = job.get("clip")
+        cover_path = job.get("cover_path")
+        if clip:
+            tag_pool.submit(embed_tags_full_rewrite_wav, str(out_wav), clip, cover_path)
+
+        try:
+            download.delete()
+        except Exception:
+            try:
+                pth = download.path()
+                if pth:
+                    Path(pth).unlink(missing_ok=True)
+            except Exception:
+                pass
 
-            page = context.pages[0] if context.pages else context.new_page()
+        try:
+            page.keyboard.press("Escape")
+        except Exception:
+            pass
 
-            self._set_status("WAV: opening suno.com…")
+    def _wav_recover(self, page: "Page", e: Exception, idx: int, total: int) -> None:
+        print(f"[WAV] {idx}/{total} FAILED: {e}", file=sys.stderr)
+        if DEBUG_TRACEBACKS:
+            print(traceback.format_exc(), file=sys.stderr)
+        try:
             page.goto("https://suno.com/", wait_until="domcontentloaded")
-            page.wait_for_timeout(1200)
+        except Exception:
+            pass
 
-            if pw_login_gate_detected(page):
-                try:
-                    context.close()
-                except Exception:
-                    pass
-                raise RuntimeError(
-                    "Suno appears signed out in the Chrome profile.\n\n"
-                    "Use “Suno Login (Chrome)”, sign in, close Chrome, then try again."
-                )
+    def _pw_get_context(self, chrome_path: Path, staging_dir: Path) -> "BrowserContext":
+        """
+        Playwright thread only. Returns the context left open by an earlier run when it is
+        still alive and downloads to the same staging dir, else a freshly launched one.
+        """
+        ctx = self._pw_context
+        if ctx is not None:
+            try:
+                # Any round-trip also dispatches a pending "close" (Chrome closed by the user)
+                ctx.cookies("https://suno.com")
+            except Exception:
+                ctx = self._pw_context = None
+        if ctx is not None and self._pw_staging_dir == staging_dir:
+            return ctx
+        self._pw_close_context()
 
-            total = len(wav_jobs)
-            failures = 0
+        if self._pw is None:
+            self._pw = sync_playwright().start()  # type: ignore
 
-            for idx, job in enumerate(wav_jobs, start=1):
-                if not self._wait_if_paused_or_stopped():
-                    print("[WAV] Stopped by user.")
-                    break
+        self._set_status("WAV: launching Chrome (Playwright)…")
+        ctx = self._pw.chromium.launch_persistent_context(
+            user_data_dir=str(PERSIST_PROFILE_DIR),
+            executable_path=str(chrome_path),
+            headless=False,
+            accept_downloads=True,
+            downloads_path=str(staging_dir),
+            args=PW_CHROME_ARGS,
+        )
+        ctx.set_default_timeout(60_000)
+        ctx.on("close", lambda *_: self._pw_forget_context(ctx))
+        self._pw_context = ctx
+        self._pw_staging_dir = staging_dir
+        return ctx
+
+    def _pw_forget_context(self, ctx: "BrowserContext") -> None:
+        if self._pw_context is ctx:
+            self._pw_context = None
+
+    def _pw_close_context(self) -> None:
+        ctx, self._pw_context = self._pw_context, None
+        if ctx is not None:
+            try:
+                ctx.close()
+            except Exception:
+                pass
 
-                song_url = job["song_url"]
-                out_wav = Path(job["out_wav"])
-                out_wav.parent.mkdir(parents=True, exist_ok=True)
+    def _pw_shutdown(self) -> None:
+        self._pw_close_context()
+        pw, self._pw = self._pw, None
+        if pw is not None:
+            try:
+                pw.stop()
+            except Exception:
+                pass
 
-                if out_wav.exists():
-                    print(f"[WAV] {idx}/{total} SKIP (exists): {out_wav.name}")
-                    continue
+    def _pw_release(self, then) -> None:
+        """
+        Closes the kept-open WAV browser (on exit / before login), then runs then() on the
+        Tk thread. The shutdown queues behind a running WAV job, which still needs the main
+        loop for its status updates while it stops, so it is polled with after() instead of
+        waited on.
+        """
+        if self._pw is None:
+            then()
+            return
+        fut = self._pw_runner.submit(self._pw_shutdown)
+        deadline = time.monotonic() + PW_RELEASE_TIMEOUT_MS / 1000
 
-                self._set_status(f"WAV: {idx}/{total} opening song page…")
-                print(f"[WAV] {idx}/{total} OPEN: {song_url}")
+        def _poll():
+            if fut.done() or time.monotonic() >= deadline:
+                then()
+            else:
+                self.after(50, _poll)
 
-                try:
-                    page.goto(song_url, wait_until="domcontentloaded")
-                    page.wait_for_timeout(1600)
+        _poll()
 
-                    if not self._wait_if_paused_or_stopped():
-                        print("[WAV] Stopped by user.")
-                        break
+    def download_wavs_in_playwright(self, wav_jobs: List[Dict[str, Any]], base_folder: str):
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("playwright is not installed")
 
-                    self._set_status(f"WAV: {idx}/{total} triggering UI download…")
-                    download = pw_trigger_ui_wav_download(page, per_song_timeout_ms=PW_PER_SONG_TIMEOUT_MS)
+        chrome_path = ensure_chrome_exe()
+        if not chrome_path or not chrome_path.exists():
+            raise RuntimeError("Chrome not available (chrome.exe not found)")
 
-                    download.save_as(str(out_wav))
-                    print(f"[WAV] {idx}/{total} SAVED: {out_wav.name}")
+        PERSIST_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
 
-                    clip = job.get("clip") or {}
-                    cover_path = job.get("cover_path")
-                    if clip:
-                        embed_tags_full_rewrite_wav(str(out_wav), clip, cover_path)
+        staging_dir = Path(base_folder) / "_pw_downloads_tmp"
+        staging_dir.mkdir(parents=True, exist_ok=True)
 
-                    try:
-                        download.delete()
-                    except Exception:
-                        try:
-                            pth = download.path()
-                            if pth:
-                                Path(pth).unlink(missing_ok=True)
-                        except Exception:
-                            pass
+        self._pw_runner.call(self._download_wavs, wav_jobs, chrome_path, staging_dir)
+
+    def _download_wavs(self, wav_jobs: List[Dict[str, Any]], chrome_path: Path, staging_dir: Path):
+        # Runs on the Playwright thread. The persistent context stays open afterwards, so
+        # Chrome is cold-started once per app session; the login is still checked every run
+        # since a kept-open session can expire in between.
+        context = self._pw_get_context(chrome_path, staging_dir)
+        page = context.pages[0] if context.pages else context.new_page()
+
+        self._set_status("WAV: opening suno.com…")
+        page.goto("https://suno.com/", wait_until="domcontentloaded")
+        pw_wait_for_page_ready(page, timeout_ms=1200)
+
+        if pw_login_gate_detected(page):
+            self._pw_close_context()
+            raise RuntimeError(
+                "Suno appears signed out in the Chrome profile.\n\n"
+                "Use “Suno Login (Chrome)”, sign in, close Chrome, then try again."
+            )
+
+        total = len(wav_jobs)
+        failures = 0
+        stopped = False
+
+        # Playwright's sync API is tied to this thread, so the tabs are driven in rounds:
+        # open the WAV modal on up to PW_WAV_TABS tabs (Suno prepares those files in
+        # parallel), then collect the downloads tab by tab in queue order.
+        n_tabs = min(PW_WAV_TABS, total)
+        tabs = list(context.pages[:n_tabs])
+        while len(tabs) < n_tabs:
+            tabs.append(context.new_page())
+        pos = 0
+
+        # Leaving the block waits for the last songs' tags before the run reports done
+        with ThreadPoolExecutor(max_workers=2) as tag_pool:
+            while pos < total and not stopped:
+                free = list(tabs)
+                opened: List[Tuple["Page", Dict[str, Any], int]] = []
+
+                while free and pos < total:
+                    if not self._wait_if_paused_or_stopped():
+                        stopped = True
+                        break
 
+                    job = wav_jobs[pos]
+                    pos += 1
+                    tab = free[0]
                     try:
-                        page.keyboard.press("Escape")
-                    except Exception:
-                        pass
+                        ready = self._wav_open_modal(tab, job, pos, total)
+                    except Exception as e:
+                        failures += 1
+                        self._wav_recover(tab, e, pos, total)
+                        continue
+                    if ready is None:
+                        stopped = True
+                        break
+                    if ready:
+                        opened.append((free.pop(0), job, pos))
 
-                except Exception as e:
-                    failures += 1
-                    print(f"[WAV] {idx}/{total} FAILED: {e}", file=sys.stderr)
-                    print(traceback.format_exc(), file=sys.stderr)
+                for tab, job, idx in opened:
+                    if stopped or not self._wait_if_paused_or_stopped():
+                        stopped = True
+                        break
                     try:
-                        page.goto("https://suno.com/", wait_until="domcontentloaded")
-                        page.wait_for_timeout(800)
-                    except Exception:
-                        pass
+                        self._wav_save(tab, job, idx, total, tag_pool)
+                    except Exception as e:
+                        failures += 1
+                        self._wav_recover(tab, e, idx, total)
 
-                time.sleep(0.25)
+                    time.sleep(0.25)
 
-            try:
-                context.close()
-            except Exception:
-                pass
+        if stopped:
+            print("[WAV] Stopped by user.")
 
-            if failures and not self.stop_event.is_set():
-                raise RuntimeError(f"WAV downloads finished with {failures} failure(s).")
+        if failures and not self.stop_event.is_set():
+            raise RuntimeError(f"WAV downloads finished with {failures} failure(s).")
 
     # ---------- main run ----------
 
@@ -2317,22 +3185,31 @@ class SunoDownloader(tk.Tk):
                         do_prompts, do_pl_idx, do_master, do_wav,
                         retag_only):
         try:
-            all_clips: List[Dict[str, Any]] = []
+            # Bound once: the per-clip closures below call these for every clip
+            wait_ok = self._wait_if_paused_or_stopped
+            set_status = self._set_status
+            is_stopped = self.stop_event.is_set
+
+            all_clips_by_id: Dict[Any, Clip] = {}
             wav_jobs: List[Dict[str, Any]] = []
             total = 0
 
-            for line in lines:
-                if not self._wait_if_paused_or_stopped():
-                    break
-                try:
-                    pid = extract_id(line)
-                    _, clips = fetch_playlist(pid)
-                except Exception:
-                    clips = fetch_clip(extract_id(line))
-                total += len(clips)
+            # Metadata for every input is fetched concurrently up front: the clip counts
+            # size the progress bar and the results are consumed by the pass below.
+            # Failures are kept in the future and surface per input there.
+            set_status(f"Fetching metadata for {len(lines)} input(s)…")
+            prefetched: Dict[int, Future] = {}
+            with ThreadPoolExecutor(max_workers=PRESCAN_WORKERS) as ex:
+                for i, line in enumerate(lines):
+                    prefetched[i] = ex.submit(lambda l=line: fetch_input(extract_id(l)))
+                for fut in as_completed(prefetched.values()):
+                    if not wait_ok():
+                        ex.shutdown(cancel_futures=True)
+                        break
+                    if fut.exception() is None:
+                        total += len(fut.result()[1])
 
-            self.after(0, lambda: self.progress.config(maximum=max(total, 1), value=0))
-            self.after(0, lambda: self.progress_label.config(text=f"0/{total}"))
+            self._set_progress(0, total)
 
             done = 0
             master_counter = 0
@@ -2341,176 +3218,226 @@ class SunoDownloader(tk.Tk):
             effective_do_audio = bool(do_audio) and not retag_only
             effective_do_wav = bool(do_wav) and not retag_only
 
-            for line in lines:
-                if not self._wait_if_paused_or_stopped():
-                    break
-
-                try:
-                    pid = extract_id(line)
-                    self._set_status(f"Fetching metadata for {pid}…")
+            # One download pool serves every input; its threads are started once per run
+            # instead of once per playlist (single-clip inputs would each pay for a pool)
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as dl_pool:
+                for i, line in enumerate(lines):
+                    if not wait_ok():
+                        break
 
                     try:
-                        name, clips = fetch_playlist(pid)
-                    except requests.HTTPError:
-                        clips = fetch_clip(pid)
-                        name = "Unsorted"
-
-                    clips = unique_clips_by_id(clips)
-
-                    dest = os.path.join(folder, sanitize(name))
-                    audio_dir = os.path.join(dest, "Audio")
-                    art_dir = os.path.join(dest, "Art")
-
-                    if not retag_only:
-                        for sec in ["Audio", "Art", "Lyrics", "Prompt", "Genres"]:
-                            os.makedirs(os.path.join(dest, sec), exist_ok=True)
-                    else:
-                        os.makedirs(audio_dir, exist_ok=True)
+                        name, clips = prefetched.pop(i).result()
+                        clips = unique_clips_by_id(clips)
 
-                    existing_by_id, version_seed = scan_audio_dir_ids(audio_dir)
-                    versions = dict(version_seed)
-
-                    for clip in clips:
-                        master_counter += 1
-                        clip["master_idx"] = master_counter
-
-                        clip_id = str(clip.get("id") or "").strip()
-
-                        if clip_id and clip_id in existing_by_id and existing_by_id[clip_id].get("base"):
-                            file_base = str(existing_by_id[clip_id]["base"])
-                        else:
-                            raw = sanitize(str(clip.get("title", ""))).strip()
-                            if not raw:
-                                raw = sanitize(clip_id or "Untitled").strip() or "Untitled"
-                            cnt = versions.get(raw, 0) + 1
-                            versions[raw] = cnt
-                            file_base = f"{raw} V{cnt}"
-
-                        clip["index_title"] = file_base
-                        clip["title"] = file_base
-
-                        thumb_guess = os.path.join(art_dir, "_thumbs", f"{file_base}.png")
-                        if os.path.exists(thumb_guess):
-                            clip["thumb_path"] = thumb_guess
-
-                        if not clip.get("cover_path"):
-                            for ext in (".jpg", ".jpeg", ".png", ".webp"):
-                                cover_guess = os.path.join(art_dir, f"{file_base}{ext}")
-                                if os.path.exists(cover_guess):
-                                    clip["cover_path"] = cover_guess
-                                    break
-
-                    for clip in clips:
-                        if not self._wait_if_paused_or_stopped():
-                            break
-
-                        file_base = str(clip["index_title"])
-                        clip_id = str(clip.get("id") or "").strip()
-
-                        mp3_expected = os.path.join(audio_dir, f"{file_base}.mp3")
-                        flac_expected = os.path.join(audio_dir, f"{file_base}.flac")
-                        wav_expected = os.path.join(audio_dir, f"{file_base}.wav")
-
-                        mp3_existing = existing_by_id.get(clip_id, {}).get("mp3") if clip_id else None
-                        flac_existing = existing_by_id.get(clip_id, {}).get("flac") if clip_id else None
-
-                        if retag_only:
-                            if clip_id:
-                                mp3_target = mp3_existing or (mp3_expected if os.path.exists(mp3_expected) else None)
-                                if mp3_target and os.path.exists(mp3_target):
-                                    self._set_status(f"Retag MP3 (fill missing): {os.path.basename(mp3_target)}")
-                                    changed = retag_mp3_fill_missing_preserve_timestamps(mp3_target, clip_id)
-                                    print(f"[RETAG] MP3 {os.path.basename(mp3_target)} changed={changed}")
+                        dest = os.path.join(folder, sanitize(name))
+                        audio_dir = os.path.join(dest, "Audio")
+                        art_dir = os.path.join(dest, "Art")
 
-                                flac_target = flac_existing or (flac_expected if os.path.exists(flac_expected) else None)
-                                if flac_target and os.path.exists(flac_target):
-                                    if FLAC_AVAILABLE:
-                                        self._set_status(f"Retag FLAC (fill missing): {os.path.basename(flac_target)}")
-                                        changed = retag_flac_fill_missing_preserve_timestamps(flac_target, clip_id)
-                                        print(f"[RETAG] FLAC {os.path.basename(flac_target)} changed={changed}")
-                                    else:
-                                        print("[RETAG] FLAC support not available (mutagen.flac import failed).")
+                        if not retag_only:
+                            for sec in ["Audio", "Art", "Lyrics", "Prompt", "Genres"]:
+                                os.makedirs(os.path.join(dest, sec), exist_ok=True)
                         else:
-                            need_thumb = (do_art or do_pl_idx or do_master or effective_do_audio or effective_do_wav) and not clip.get("thumb_path")
-                            need_cover = (effective_do_audio or effective_do_wav) and not clip.get("cover_path")
-
-                            if (need_thumb or need_cover) and clip.get("img"):
-                                self._set_status(f"Downloading artwork: {file_base}")
-                                full, thumb = download_image(str(clip.get("img")), art_dir, file_base)
+                            os.makedirs(audio_dir, exist_ok=True)
+
+                        # One listing per directory; per-clip existence checks are set lookups.
+                        # Each clip only ever writes its own file_base, so a snapshot taken here
+                        # stays valid for the rest of this input.
+                        existing_by_id, version_seed, audio_names = scan_audio_dir_ids(audio_dir)
+                        versions = dict(version_seed)
+                        art_names = _dir_names(art_dir)
+                        thumb_names = _dir_names(os.path.join(art_dir, "_thumbs"))
+
+                        # Per-clip paths are built by concatenation onto these prefixes
+                        audio_prefix = audio_dir + os.sep
+                        art_prefix = art_dir + os.sep
+                        thumbs_prefix = os.path.join(art_dir, "_thumbs") + os.sep
+                        prompt_dir = os.path.join(dest, "Prompt")
+                        lyrics_dir = os.path.join(dest, "Lyrics")
+                        genres_dir = os.path.join(dest, "Genres")
+
+                        for clip in clips:
+                            master_counter += 1
+                            clip.master_idx = master_counter
+
+                            clip_id = _s(clip.id).strip()
+
+                            if clip_id and clip_id in existing_by_id and existing_by_id[clip_id].get("base"):
+                                file_base = str(existing_by_id[clip_id]["base"])
+                            else:
+                                raw = sanitize(_s(clip.title)).strip()
+                                if not raw:
+                                    raw = sanitize(clip_id or "Untitled").strip() or "Untitled"
+                                cnt = versions.get(raw, 0) + 1
+                                versions[raw] = cnt
+                                file_base = f"{raw} V{cnt}"
+
+                            clip.index_title = file_base
+                            clip.title = file_base
+
+                            base_key = os.path.normcase(file_base)
+                            if f"{base_key}.png" in thumb_names:
+                                clip.thumb_path = f"{thumbs_prefix}{file_base}.png"
+
+                            if not clip.cover_path:
+                                for ext in (".jpg", ".jpeg", ".png", ".webp"):
+                                    if f"{base_key}{ext}" in art_names:
+                                        clip.cover_path = f"{art_prefix}{file_base}{ext}"
+                                        break
+
+                        def _download_clip(clip: Clip) -> Tuple[bool, Optional[Dict[str, Any]]]:
+                            if not wait_ok():
+                                return False, None
+
+                            file_base = clip.index_title
+                            base_key = os.path.normcase(file_base)
+                            clip_id = _s(clip.id).strip()
+
+                            mp3_existing = existing_by_id.get(clip_id, {}).get("mp3") if clip_id else None
+
+                            need_thumb = (do_art or do_pl_idx or do_master or effective_do_audio or effective_do_wav) and not clip.thumb_path
+                            need_cover = (effective_do_audio or effective_do_wav) and not clip.cover_path
+
+                            if (need_thumb or need_cover) and clip.img:
+                                set_status(f"Downloading artwork: {file_base}")
+                                full, thumb, thumb_png = download_image(clip.img, art_dir, file_base)
                                 if full:
-                                    clip["cover_path"] = full
+                                    clip.cover_path = full
                                 if thumb:
-                                    clip["thumb_path"] = thumb
+                                    clip.thumb_path = thumb
+                                    clip.thumb_png = thumb_png
 
                             already_have_audio_for_id = bool(
                                 clip_id and clip_id in existing_by_id and (existing_by_id[clip_id].get("mp3") or existing_by_id[clip_id].get("flac"))
                             )
 
                             if effective_do_audio:
-                                if already_have_audio_for_id and mp3_existing and os.path.exists(mp3_existing):
-                                    print(f"[DUP] Audio exists for ID {clip_id}, skip MP3 download: {Path(mp3_existing).name}")
-                                elif os.path.exists(mp3_expected):
-                                    print(f"[DUP] MP3 exists, skip: {Path(mp3_expected).name}")
+                                if already_have_audio_for_id and mp3_existing:
+                                    print(f"[DUP] Audio exists for ID {clip_id}, skip MP3 download: {os.path.basename(mp3_existing)}")
+                                elif f"{base_key}.mp3" in audio_names:
+                                    print(f"[DUP] MP3 exists, skip: {file_base}.mp3")
                                 else:
-                                    self._set_status(f"Downloading MP3: {file_base}.mp3")
+                                    set_status(f"Downloading MP3: {file_base}.mp3")
                                     mp3_path = save_mp3(clip, audio_dir, file_base)
                                     if mp3_path:
-                                        self._set_status(f"Tagging MP3: {file_base}.mp3")
-                                        embed_tags_full_rewrite_mp3(mp3_path, clip, clip.get("cover_path"))
+                                        set_status(f"Tagging MP3: {file_base}.mp3")
+                                        embed_tags_full_rewrite_mp3(mp3_path, clip, clip.cover_path)
                                     else:
                                         print(f"[MP3] Could not download MP3 for {file_base}")
 
+                            sidecars: List[Tuple[str, str]] = []
                             if do_prompts:
-                                save_txt(os.path.join(dest, "Prompt"), file_base, str(clip.get("gpt", "") or ""))
+                                sidecars.append((prompt_dir, _s(clip.gpt)))
                             if do_lyrics:
-                                save_txt(os.path.join(dest, "Lyrics"), file_base, str(clip.get("lyrics") or clip.get("prompt") or ""))
+                                sidecars.append((lyrics_dir, _s(clip.lyrics or clip.prompt)))
                             if do_genres:
-                                save_txt(os.path.join(dest, "Genres"), file_base, str(clip.get("tags", "") or ""))
+                                sidecars.append((genres_dir, _s(clip.tags)))
+                            if sidecars:
+                                save_txts(file_base, sidecars)
 
+                            wav_job = None
                             if effective_do_wav and clip_id:
-                                if not os.path.exists(wav_expected):
-                                    wav_jobs.append({
+                                if f"{base_key}.wav" not in audio_names:
+                                    wav_job = {
                                         "clip_id": clip_id,
                                         "song_url": f"https://suno.com/song/{clip_id}",
-                                        "out_wav": wav_expected,
+                                        "out_wav": f"{audio_prefix}{file_base}.wav",
                                         "clip": clip,
-                                        "cover_path": clip.get("cover_path"),
-                                    })
+                                        "cover_path": clip.cover_path,
+                                    }
                                 else:
-                                    print(f"[DUP] WAV exists, skip queue: {Path(wav_expected).name}")
+                                    print(f"[DUP] WAV exists, skip queue: {file_base}.wav")
 
-                        done += 1
-                        self.after(0, lambda d=done: self.progress.config(value=d))
-                        self.after(0, lambda d=done, t=total: self.progress_label.config(text=f"{d}/{t}"))
+                            return True, wav_job
 
-                    if do_pl_idx and name not in processed_playlists and not self.stop_event.is_set():
-                        xlsx_path = os.path.join(dest, f"{name}.xlsx")
-                        id_to_title = {str(c["id"]): str(c["index_title"]) for c in clips if c.get("id")}
+                        def _retag_clip(clip: Clip) -> Tuple[bool, Optional[Dict[str, Any]]]:
+                            if not wait_ok():
+                                return False, None
 
-                        self._set_status(f"Updating playlist index for {name}…")
+                            file_base = clip.index_title
+                            base_key = os.path.normcase(file_base)
+                            clip_id = _s(clip.id).strip()
 
-                        if os.path.exists(xlsx_path):
-                            update_index_titles_in_place(xlsx_path, name, id_to_title)
-                            appended = append_missing_rows_preserve_thumbs(xlsx_path, name, clips)
-                            print(f"[XLSX] Playlist appended={appended}")
-                        else:
-                            create_index_xlsx(clips, xlsx_path, name)
+                            mp3_existing = existing_by_id.get(clip_id, {}).get("mp3") if clip_id else None
+                            flac_existing = existing_by_id.get(clip_id, {}).get("flac") if clip_id else None
 
-                        processed_playlists.add(name)
+                            if clip_id:
+                                mp3_target = mp3_existing or (f"{audio_prefix}{file_base}.mp3" if f"{base_key}.mp3" in audio_names else None)
+                                if mp3_target:
+                                    set_status(f"Retag MP3 (fill missing): {os.path.basename(mp3_target)}")
+                                    known = mp3_target == mp3_existing and bool(existing_by_id[clip_id].get("mp3_tagged"))
+                                    changed = retag_mp3_fill_missing_preserve_timestamps(mp3_target, clip_id, known_has_id=known)
+                                    print(f"[RETAG] MP3 {os.path.basename(mp3_target)} changed={changed}")
 
-                    all_clips.extend(clips)
+                                flac_target = flac_existing or (f"{audio_prefix}{file_base}.flac" if f"{base_key}.flac" in audio_names else None)
+                                if flac_target:
+                                    if FLAC_AVAILABLE:
+                                        set_status(f"Retag FLAC (fill missing): {os.path.basename(flac_target)}")
+                                        changed = retag_flac_fill_missing_preserve_timestamps(flac_target, clip_id)
+                                        print(f"[RETAG] FLAC {os.path.basename(flac_target)} changed={changed}")
+                                    else:
+                                        print("[RETAG] FLAC support not available (mutagen.flac import failed).")
 
-                except Exception as e:
-                    print(f"[ERROR] processing input “{line}”: {e}", file=sys.stderr)
-                    print(traceback.format_exc(), file=sys.stderr)
-                    continue
+                            return True, None
+
+                        # Retag and download both go through the shared pool; each clip only
+                        # touches its own files, so tag reads/writes overlap across clips
+                        process_clip = _retag_clip if retag_only else _download_clip
+
+                        if clips:
+                            wav_by_pos: Dict[int, Dict[str, Any]] = {}
+                            futures = {dl_pool.submit(process_clip, c): pos for pos, c in enumerate(clips)}
+                            for fut in as_completed(futures):
+                                try:
+                                    processed, wav_job = fut.result()
+                                except Exception as e:
+                                    clip = clips[futures[fut]]
+                                    print(f"[ERROR] processing clip “{clip.index_title}”: {e}", file=sys.stderr)
+                                    if DEBUG_TRACEBACKS:
+                                        print(traceback.format_exc(), file=sys.stderr)
+                                    continue
+                                if not processed:
+                                    continue
+                                if wav_job:
+                                    wav_by_pos[futures[fut]] = wav_job
+
+                                done += 1
+                                self._set_progress(done, total)
+
+                            # Keep WAV jobs in playlist order regardless of completion order
+                            wav_jobs.extend(wav_by_pos[pos] for pos in sorted(wav_by_pos))
+
+                        if do_pl_idx and name not in processed_playlists and not is_stopped():
+                            xlsx_path = os.path.join(dest, f"{name}.xlsx")
+                            id_to_title = {_s(c.id): c.index_title for c in clips if c.id}
+
+                            set_status(f"Updating playlist index for {name}…")
+
+                            if os.path.exists(xlsx_path):
+                                update_index_titles_in_place(xlsx_path, name, id_to_title)
+                                appended = append_missing_rows_preserve_thumbs(xlsx_path, name, clips)
+                                print(f"[XLSX] Playlist appended={appended}")
+                            else:
+                                create_index_xlsx(clips, xlsx_path, name)
+
+                            processed_playlists.add(name)
+
+                        # Deduplicated across playlists as they finish (first clip per ID wins,
+                        # clips without an ID are all kept), so the master step is a plain list()
+                        for c in clips:
+                            all_clips_by_id.setdefault(_s(c.id).strip() or id(c), c)
+
+                    except Exception as e:
+                        print(f"[ERROR] processing input “{line}”: {e}", file=sys.stderr)
+                        if DEBUG_TRACEBACKS:
+                            print(traceback.format_exc(), file=sys.stderr)
+                        continue
 
-            if do_master and all_clips and not self.stop_event.is_set():
+            if do_master and all_clips_by_id and not is_stopped():
                 master_path = os.path.join(folder, "Suno Master Index.xlsx")
-                unique_all = unique_clips_by_id(all_clips)
-                id_to_title = {str(c["id"]): str(c["index_title"]) for c in unique_all if c.get("id")}
+                unique_all = list(all_clips_by_id.values())
+                id_to_title = {_s(c.id): c.index_title for c in unique_all if c.id}
 
-                self._set_status("Updating master index…")
+                set_status("Updating master index…")
 
                 if os.path.exists(master_path):
                     update_index_titles_in_place(master_path, "Master", id_to_title)
@@ -2519,9 +3446,9 @@ class SunoDownloader(tk.Tk):
                 else:
                     create_index_xlsx(unique_all, master_path, "Master")
 
-            if effective_do_wav and not self.stop_event.is_set():
+            if effective_do_wav and not is_stopped():
                 print(f"[WAV] queued jobs: {len(wav_jobs)}")
-                self._set_status(f"WAV: queued {len(wav_jobs)} song(s).")
+                set_status(f"WAV: queued {len(wav_jobs)} song(s).")
 
                 if not PLAYWRIGHT_AVAILABLE:
                     self.after(0, lambda: messagebox.showerror(
@@ -2533,13 +3460,13 @@ class SunoDownloader(tk.Tk):
                 elif wav_jobs:
                     try:
                         self.download_wavs_in_playwright(wav_jobs, folder)
-                        if self.stop_event.is_set():
-                            self._set_status("Stopped.")
+                        if is_stopped():
+                            set_status("Stopped.")
                         else:
-                            self._set_status("WAV: done.")
+                            set_status("WAV: done.")
                     except Exception as e:
-                        if not self.stop_event.is_set():
-                            self._set_status(f"WAV: error: {e}")
+                        if not is_stopped():
+                            set_status(f"WAV: error: {e}")
                             print("[WAV] ERROR:", e, file=sys.stderr)
                             print(traceback.format_exc(), file=sys.stderr)
                             self.after(0, lambda err=str(e): messagebox.showerror("WAV download error", err))
@@ -2551,7 +3478,7 @@ class SunoDownloader(tk.Tk):
                 self.login_btn.config(state=tk.NORMAL)
                 self.download_btn.config(state=tk.NORMAL)
                 self._set_running_controls(False)
-                if self.stop_event.is_set():
+                if is_stopped():
                     self.status_label.config(text="Stopped.")
                     messagebox.showinfo("Stopped", f"Stopped at {done}/{total}.")
                 else:
@@ -2578,13 +3505,19 @@ class SunoDownloader(tk.Tk):
             except Exception:
                 pass
 
+        finally:
+            _apic_bytes.cache_clear()
+
     def on_close(self):
+        if self._closing:
+            return
+        self._closing = True
         try:
             self.stop_event.set()
             self.pause_event.clear()
         except Exception:
             pass
-        self.destroy()
+        self._pw_release(self.destroy)
 
 
 if __name__ == "__main__":